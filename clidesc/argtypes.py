@@ -0,0 +1,216 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Argument types and actions for files and large argument lists."""
+
+import os
+import sys
+import mmap
+import array
+from argparse import Action, ArgumentError, ArgumentTypeError
+
+FILE_TYPES = ["file", "stream", "lines", "mmap"]
+
+
+class FileArgument:
+    """A file argument, opened when the handler is called."""
+
+    def __init__(self, kind, mode, path):
+        """Initialize the argument with its type, open mode and path."""
+        self.kind = kind
+        self.mode = "rb" if kind == "mmap" else mode
+        self.path = path
+
+    def __repr__(self):
+        """Represent the argument by its type and path."""
+        return f"{self.kind}:{self.path}"
+
+    def __is_std(self):
+        return self.path == "-" and self.kind in ["stream", "lines"]
+
+    def __open_std(self):
+        writing = any(m in self.mode for m in "wax")
+        stream = sys.stdout if writing else sys.stdin
+        return stream.buffer if "b" in self.mode else stream
+
+    def open(self, stack):
+        """Open the file, registering its cleanup on an ExitStack."""
+        if self.__is_std():
+            stream = self.__open_std()
+        else:
+            # pylint: disable=consider-using-with
+            stream = stack.enter_context(open(self.path, self.mode))
+        if self.kind == "lines":
+            return (line.rstrip("\n") for line in stream)
+        if self.kind == "mmap":
+            if os.fstat(stream.fileno()).st_size == 0:
+                return b""
+            return stack.enter_context(
+                mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            )
+        return stream
+
+
+class FileType:  # pylint: disable=too-few-public-methods
+    """Argument type converter for file arguments."""
+
+    def __init__(self, kind, mode="r"):
+        """Initialize the converter for a file type and open mode."""
+        self.kind = kind
+        self.mode = mode
+        self.__name__ = kind
+
+    def __call__(self, path):
+        """Convert a path to a FileArgument, checking files to be read."""
+        argument = FileArgument(self.kind, self.mode, path)
+        reading = "r" in argument.mode and "+" not in argument.mode
+        if reading and path != "-" and not os.path.isfile(path):
+            raise ArgumentTypeError(f"can't open '{path}': file not found")
+        return argument
+
+
+def open_file_arguments(args, stack):
+    """Replace FileArgument values in args by the opened objects."""
+    for name, value in args.items():
+        if isinstance(value, FileArgument):
+            args[name] = value.open(stack)
+        elif isinstance(value, list) and any(
+            isinstance(item, FileArgument) for item in value
+        ):
+            args[name] = [
+                item.open(stack) if isinstance(item, FileArgument) else item
+                for item in value
+            ]
+
+
+def convert_value(datatype, value):
+    """Convert a value, with an error message similar to argparse's."""
+    try:
+        return datatype(value)
+    except (TypeError, ValueError):
+        name = getattr(datatype, "__name__", repr(datatype))
+        raise ArgumentTypeError(f"invalid {name} value: '{value}'") from None
+
+
+def _read_values(stream):
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def iter_values(values, datatype=str):
+    """Iterate over values, expanding response files and stdin."""
+    for value in values:
+        if value == "-":
+            yield from (
+                convert_value(datatype, v) for v in _read_values(sys.stdin)
+            )
+        elif value.startswith("@"):
+            with open(value[1:], "r") as response_file:
+                yield from (
+                    convert_value(datatype, v)
+                    for v in _read_values(response_file)
+                )
+        else:
+            yield convert_value(datatype, value)
+
+
+class ResponseFileAction(Action):  # pylint: disable=too-few-public-methods
+    """Store argument values, reading `@file` and `-` values from files."""
+
+    def __init__(self, option_strings, dest, datatype=str, lazy=False, **kw):
+        """Initialize action with the values type and laziness."""
+        super().__init__(option_strings, dest, **kw)
+        self.datatype = datatype
+        self.lazy = lazy
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        """Store the values as a list, or as an iterator if lazy."""
+        single = not isinstance(values, list)
+        values = iter_values([values] if single else values, self.datatype)
+        if not self.lazy or single:
+            try:
+                values = list(values)
+            except (ArgumentTypeError, OSError) as error:
+                raise ArgumentError(self, str(error)) from None
+            if single:
+                values = values[0] if values else None
+        setattr(namespace, self.dest, values)
+
+
+ARRAY_TYPECODES = {int: "q", float: "d"}
+
+
+def to_array(values, datatype, container="array"):
+    """
+    Convert a list of strings to an array of `datatype`, in bulk.
+
+    With `container` set to `numpy`, a NumPy array is created, if NumPy is
+    available, otherwise, and with `container` set to `array`, an
+    `array.array` is created.
+    """
+    try:
+        if container == "numpy":
+            try:
+                import numpy  # pylint: disable=import-outside-toplevel
+            except ImportError:
+                pass
+            else:
+                return numpy.array(values, dtype=str).astype(datatype)
+        return array.array(ARRAY_TYPECODES[datatype], map(datatype, values))
+    except (ValueError, OverflowError):
+        # find the invalid value, to report it as argparse would.
+        for value in values:
+            convert_value(datatype, value)
+        raise ArgumentTypeError(
+            f"{datatype.__name__} value out of range"
+        ) from None
+
+
+class ArrayAction(Action):  # pylint: disable=too-few-public-methods
+    """Store argument values as an array of numbers."""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        option_strings,
+        dest,
+        datatype=int,
+        array_kind="array",
+        response_files=False,
+        **kw,
+    ):
+        """Initialize action with the values type and kind of array."""
+        if datatype not in ARRAY_TYPECODES:
+            name = getattr(datatype, "__name__", repr(datatype))
+            raise ValueError(f"Invalid type for array container: {name}")
+        super().__init__(option_strings, dest, **kw)
+        self.datatype = datatype
+        self.array_kind = array_kind
+        self.response_files = response_files
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        """Store the values as an array."""
+        if not isinstance(values, list):
+            values = [values]
+        try:
+            if self.response_files:
+                values = list(iter_values(values))
+            values = to_array(values, self.datatype, self.array_kind)
+        except (ArgumentTypeError, OSError) as error:
+            raise ArgumentError(self, str(error)) from None
+        setattr(namespace, self.dest, values)
@@ -0,0 +1,219 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Caches for command handler results and help output."""
+
+import os
+import sys
+import time
+import json
+import pickle
+import shutil
+import hashlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+def default_cache_dir(program, *path):
+    """Return the default cache directory for a program."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "clidesc", program, *path)
+
+
+class ResultCache(ABC):
+    """Base class for handler result caches."""
+
+    def __init__(self, ttl=None, key=None, max_entries=128):
+        """Initialize cache with expiration and key configuration."""
+        self.ttl = ttl
+        self.key_fields = key
+        self.max_entries = max_entries
+
+    def key(self, handler, args):
+        """Create the cache key for a handler call with the given args."""
+        fields = self.key_fields
+        if fields is None:
+            fields = sorted(args)
+        selected = [(name, args.get(name)) for name in fields]
+        text = repr((handler, selected))
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _expiration(self):
+        return time.time() + self.ttl if self.ttl else None
+
+    @staticmethod
+    def _expired(expires):
+        return expires is not None and expires < time.time()
+
+    @abstractmethod
+    def get(self, key):
+        """Return a tuple (hit, value) for the given key."""
+
+    @abstractmethod
+    def set(self, key, value):
+        """Store a value for the given key."""
+
+
+class MemoryCache(ResultCache):
+    """In-memory LRU cache."""
+
+    def __init__(self, **kwargs):
+        """Initialize an empty in-memory cache."""
+        super().__init__(**kwargs)
+        self.__entries = OrderedDict()
+
+    def get(self, key):
+        """Return a tuple (hit, value) for the given key."""
+        if key not in self.__entries:
+            return False, None
+        expires, value = self.__entries[key]
+        if self._expired(expires):
+            del self.__entries[key]
+            return False, None
+        self.__entries.move_to_end(key)
+        return True, value
+
+    def set(self, key, value):
+        """Store a value for the given key, evicting the oldest entries."""
+        self.__entries[key] = (self._expiration(), value)
+        self.__entries.move_to_end(key)
+        while self.max_entries and len(self.__entries) > self.max_entries:
+            self.__entries.popitem(last=False)
+
+    def __len__(self):
+        """Return the number of cached entries."""
+        return len(self.__entries)
+
+
+class DiskCache(ResultCache):
+    """On-disk LRU cache, with one pickle file per entry."""
+
+    def __init__(self, path, max_size=None, **kwargs):
+        """Initialize a cache stored in the directory `path`."""
+        super().__init__(**kwargs)
+        self.path = os.path.expanduser(path)
+        self.max_size = max_size
+
+    def __entry(self, key):
+        return os.path.join(self.path, f"{key}.pickle")
+
+    def get(self, key):
+        """Return a tuple (hit, value) for the given key."""
+        filename = self.__entry(key)
+        try:
+            with open(filename, "rb") as entry:
+                expires, value = pickle.load(entry)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False, None
+        if self._expired(expires):
+            os.remove(filename)
+            return False, None
+        os.utime(filename)
+        return True, value
+
+    def set(self, key, value):
+        """Store a value for the given key, evicting the oldest entries."""
+        os.makedirs(self.path, exist_ok=True)
+        filename = self.__entry(key)
+        tmpname = f"{filename}.{os.getpid()}"
+        with open(tmpname, "wb") as entry:
+            pickle.dump((self._expiration(), value), entry)
+        os.replace(tmpname, filename)
+        self.__evict()
+
+    def __evict(self):
+        entries = []
+        for name in os.listdir(self.path):
+            if name.endswith(".pickle"):
+                stat = os.stat(os.path.join(self.path, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        while entries and (
+            (self.max_entries and len(entries) > self.max_entries)
+            or (self.max_size and total > self.max_size)
+        ):
+            _, size, name = entries.pop(0)
+            os.remove(os.path.join(self.path, name))
+            total -= size
+
+
+def create_cache(program, cache_cfg):
+    """Create a result cache from a command `cache` configuration."""
+    if isinstance(cache_cfg, bool):
+        cache_cfg = {}
+    options = {
+        "ttl": cache_cfg.get("ttl"),
+        "key": cache_cfg.get("key"),
+        "max_entries": cache_cfg.get("max_entries", 128),
+    }
+    store = cache_cfg.get("store", "memory")
+    if store == "memory":
+        return MemoryCache(**options)
+    if store == "disk":
+        path = cache_cfg.get("path", default_cache_dir(program, "results"))
+        return DiskCache(path, max_size=cache_cfg.get("max_size"), **options)
+    raise ValueError(f"Invalid cache store: {store}")
+
+
+class HelpCache:
+    """On-disk cache of the formatted help text of each command."""
+
+    def __init__(self, path, cli_description):
+        """Initialize help cache for a CLI description."""
+        self.path = os.path.expanduser(path)
+        self.__description = cli_description
+        self.__digest = None
+
+    def __entry(self, command_path):
+        # help text also depends on the versions of clidesc and argparse.
+        version = sys.modules[__package__].__version__
+        if self.__digest is None:
+            text = json.dumps(self.__description, sort_keys=True, default=str)
+            self.__digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        width = shutil.get_terminal_size().columns
+        key = repr(
+            (version, sys.version_info[:2], self.__digest, width, command_path)
+        )
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.path, f"{name}.txt")
+
+    def get(self, command_path):
+        """Return the cached help text for a command path, or None."""
+        try:
+            with open(self.__entry(command_path), "r") as entry:
+                return entry.read()
+        except OSError:
+            return None
+
+    def set(self, command_path, text):
+        """Store the help text for a command path."""
+        os.makedirs(self.path, exist_ok=True)
+        filename = self.__entry(command_path)
+        with open(f"{filename}.{os.getpid()}", "w") as entry:
+            entry.write(text)
+        os.replace(f"{filename}.{os.getpid()}", filename)
+
+
+def create_help_cache(program, help_cache_cfg, cli_description):
+    """Create a help cache from the `help_cache` configuration."""
+    path = help_cache_cfg
+    if not isinstance(path, str):
+        path = default_cache_dir(program, "help")
+    return HelpCache(path, cli_description)
@@ -18,19 +18,16 @@
 """clidesc implementation."""
 
 import sys
-import re
-import itertools
-from argparse import ArgumentParser
 import importlib
-import traceback
 
-try:
-    import yaml
-except ImportError:  # pragma: no cover
-    pass
+# Modules only needed by some code paths (loading files, building parsers,
+# handling exceptions) are imported when used, to keep `import clidesc` fast.
+# pylint: disable=import-outside-toplevel
 
 # pylint: disable=too-many-instance-attributes
 
+PIPE_SEPARATOR = ":::"
+
 
 class Object:  # pylint: disable=too-few-public-methods
     """Used to add attributes on demand."""
@@ -42,46 +39,227 @@ class CLIDesc:
     @classmethod
     def from_file(cls, filename):
         """Load the CLI configuration from a YAML or JSON file."""
+        cli = cls(cls.__read_file(filename))
+        cli.__filename = filename  # pylint: disable=unused-private-member
+        return cli
+
+    @staticmethod
+    def __read_file(filename):
+        import yaml
+
         with open(filename, "r") as cli_description:
-            return cls(yaml.safe_load(cli_description.read()))
+            return yaml.safe_load(cli_description.read())
 
     def __init__(self, cli_description):
         """Initialize framework with the provided description."""
-        self.__description = cli_description
-        program = cli_description["program"]
-        description = cli_description["description"]
-        self.__argparse = ArgumentParser(prog=program, description=description)
-        if "version" in cli_description:
-            version = cli_description["version"]
-            if isinstance(version, dict):
-                *module, attr = version["attribute"].split(".")
-                module = ".".join(module) if module else "builtins"
-                imp_mod = importlib.import_module(module)
-                if not hasattr(imp_mod, attr):
-                    raise ValueError(
-                        f"Module `{module}` has no attribute `{attr}`"
-                    )
-                version = getattr(imp_mod, attr)
-            self.__argparse.add_argument(
-                "--version",
-                action="version",
-                help="display program version",
-                version=f"%(prog)s {version}",
-            )
-
+        self.__filename = None
+        self.__watcher = None
+        self.__description = {}
+        self.__timer = None
+        self.__themes = {}
+        self.__pools = {}
+        self.metrics = None
+        self.tracer = None
+        self.handler_loader = None
+        self.use_cache = True
+        self.use_output_files = True
         self.configuration = Object()
-        self.__non_parameters = []
-        self.__output = {}
-        self.__commands = {}
         self.output_stream = sys.stdout
         self.exit_code = 0
-        self.__add_group(None, self.__argparse, program, cli_description)
+        self.__configure(cli_description)
+        self.__reset_parser()
+
+    def __configure(self, cli_description):
+        """Set the CLI description, without changing the parsers."""
+        if "plugins" in cli_description:
+            from .plugins import load_plugin_commands, merge_commands
+
+            cli_description = merge_commands(
+                cli_description,
+                load_plugin_commands(
+                    cli_description["program"], cli_description["plugins"]
+                ),
+            )
+        self.__version = self.__get_version(cli_description)
+        self.__help_cache = None
+        if cli_description.get("help_cache"):
+            from .cache import create_help_cache
+
+            self.__help_cache = create_help_cache(
+                cli_description["program"],
+                cli_description["help_cache"],
+                cli_description,
+            )
+        metrics_cfg = cli_description.get("metrics")
+        if metrics_cfg != self.__description.get("metrics"):
+            from .metrics import create_metrics
+
+            self.metrics = create_metrics(metrics_cfg) if metrics_cfg else None
+        trace_cfg = cli_description.get("trace")
+        if trace_cfg != self.__description.get("trace"):
+            from .trace import Tracer
+
+            self.tracer = Tracer(trace_cfg) if trace_cfg else None
+        self.__description = cli_description
+
+    def __reset_parser(self):
+        """Discard the argument parsers, and rebuild the command trie."""
+        from .commands import build_command_trie
+
+        self.__argparse = None
+        self.__non_parameters = []
+        self.__commands = build_command_trie(self.__description)
+
+    def reload(self, cli_description=None):
+        """
+        Reload the CLI description, rebuilding only the changed commands.
+
+        If no description is given, it is read again from the file used to
+        create the CLIDesc object.
+        """
+        if cli_description is None:
+            cli_description = self.__read_file(self.__filename)
+        previous = self.__description
+        self.__configure(cli_description)
+        if self.__argparse is None or self.__own_attributes(
+            previous
+        ) != self.__own_attributes(self.__description):
+            self.__reset_parser()
+        else:
+            self.__reload_commands(previous, self.__description, ())
+
+    def watch(self, filename=None, interval=1.0):
+        """Reload the description, on the next run, if its file changes."""
+        from .watcher import FileWatcher
+
+        filename = filename or self.__filename
+        if filename is None:
+            raise ValueError("No CLI description file to watch.")
+        if self.__watcher is not None:
+            self.__watcher.stop()
+        self.__watcher = FileWatcher(filename, interval)
+        self.__watcher.start()
+        return self.__watcher
+
+    def __reload_watched(self):
+        """Reload the watched file, keeping the description on errors."""
+        previous = self.__description
+        try:
+            cli_description = self.__read_file(self.__watcher.filename)
+            if not isinstance(cli_description, dict):
+                raise ValueError("Invalid CLI description.")
+            self.reload(cli_description)
+        except Exception as exc:  # pylint: disable=broad-except
+            print(
+                f"ERROR: cannot reload {self.__watcher.filename}: {exc}",
+                file=sys.stderr,
+            )
+            if self.__description is not previous:
+                self.__configure(previous)
+                self.__reset_parser()
 
-    def __add_group(self, subparser, parser, command, cmd_description):
-        handler = cmd_description.get("handler")
-        if handler:
-            self.__commands[f"{command}"] = handler
-            self.__output[handler] = cmd_description.get("output")
+    @staticmethod
+    def __own_attributes(cmd_description):
+        """Get command attributes, replacing sub commands by their names."""
+        own = dict(cmd_description)
+        sub_commands = dict(own.pop("sub_commands", None) or {})
+        commands = sub_commands.pop("commands", None) or []
+        own["sub_commands"] = sub_commands
+        own["sub_command_names"] = [command["name"] for command in commands]
+        return own
+
+    def __reload_commands(self, previous, cmd_description, path):
+        """Rebuild the sub commands that changed from `previous`."""
+        previous = {
+            command["name"]: command
+            for command in previous.get("sub_commands", {}).get("commands")
+            or []
+        }
+        sub_commands = cmd_description.get("sub_commands", {})
+        for command in sub_commands.get("commands") or []:
+            cmd_path = path + (command["name"],)
+            old = previous[command["name"]]
+            if self.__own_attributes(old) != self.__own_attributes(command):
+                self.__rebuild_command(cmd_path, command)
+            else:
+                self.__reload_commands(old, command, cmd_path)
+
+    def __rebuild_command(self, path, cmd_description):
+        """Replace the parser of a command, and of its sub commands."""
+        # pylint: disable=protected-access
+        from .commands import build_command_trie
+
+        name = path[-1]
+        parent = self.__commands.find(path[:-1])
+        subparser = parent.subparser
+        for alias in parent.children[name].aliases:
+            subparser._name_parser_map.pop(alias, None)
+        command = build_command_trie(cmd_description, path)
+        parent.add(command)
+        parser = subparser._parser_class(
+            prog=f"{subparser._prog_prefix} {name}"
+        )
+        for alias in [name] + command.aliases:
+            subparser._name_parser_map[alias] = parser
+        for choice in subparser._choices_actions:
+            if choice.dest == name:
+                choice.help = cmd_description["description"]
+                choice.metavar = name
+                if command.aliases:
+                    choice.metavar += f" ({', '.join(command.aliases)})"
+        self.__add_group(parser, command)
+
+    @staticmethod
+    def __get_version(cli_description):
+        version = cli_description.get("version")
+        if isinstance(version, dict):
+            *module, attr = version["attribute"].split(".")
+            module = ".".join(module) if module else "builtins"
+            imp_mod = importlib.import_module(module)
+            if not hasattr(imp_mod, attr):
+                raise ValueError(f"Module `{module}` has no attribute `{attr}`")
+            version = getattr(imp_mod, attr)
+        return version
+
+    def __get_parser(self):
+        """Build the argument parser tree, on first use."""
+        if self.__argparse is None:
+            from argparse import ArgumentParser
+
+            program = self.__description["program"]
+            description = self.__description["description"]
+            parser = ArgumentParser(prog=program, description=description)
+            if self.__version is not None:
+                parser.add_argument(
+                    "--version",
+                    action="version",
+                    help="display program version",
+                    version=f"%(prog)s {self.__version}",
+                )
+            if self.__description.get("shell"):
+                parser.add_argument(
+                    "--shell",
+                    action="store_true",
+                    dest="_cli_shell",
+                    help="start an interactive shell",
+                )
+            if self.__description.get("output_file"):
+                parser.add_argument(
+                    "--output-file",
+                    dest="_cli_output_file",
+                    metavar="FILE",
+                    help="write the output to FILE, compressed if FILE ends"
+                    " with .gz, .bz2 or .xz",
+                )
+            self.__add_group(parser, self.__commands)
+            self.__argparse = parser
+        return self.__argparse
+
+    def __add_group(self, parser, command):
+        command.parser = parser
+        cmd_description = command.description
+        if command.handler and cmd_description.get("cache"):
+            self.__add_cache(parser, command, cmd_description["cache"])
 
         for argument in cmd_description.get("arguments", []):
             self.__add_argument(parser, argument)
@@ -95,60 +273,337 @@ class CLIDesc:
                     sub_parser_args[item] = sub_commands[item]
             if "group_name" in sub_commands:
                 sub_parser_args["metavar"] = sub_commands["group_name"]
-            subparser = parser.add_subparsers(
-                dest="_cli_command", **sub_parser_args
+            # each level has its own destination, to build the command path.
+            command.subparser = parser.add_subparsers(
+                dest=f"_cli_command_{len(command.path)}", **sub_parser_args
             )
             for cmd_group in sub_commands.get("commands"):
-                new_parser = subparser.add_parser(
-                    cmd_group["name"], help=cmd_group["description"]
-                )
-                self.__add_group(
-                    subparser, new_parser, cmd_group["name"], cmd_group
+                child = command.children[cmd_group["name"]]
+                new_parser = command.subparser.add_parser(
+                    cmd_group["name"],
+                    aliases=child.aliases,
+                    help=cmd_group["description"],
                 )
+                self.__add_group(new_parser, child)
+
+    def __add_cache(self, parser, command, cache_cfg):
+        from .cache import create_cache
+
+        program = self.__description["program"]
+        command.cache = create_cache(program, cache_cfg)
+        parser.add_argument(
+            "--no-cache",
+            dest="_cli_no_cache",
+            action="store_true",
+            help="do not use cached results",
+        )
+        parser.add_argument(
+            "--refresh-cache",
+            dest="_cli_refresh_cache",
+            action="store_true",
+            help="ignore cached results and update the cache",
+        )
 
     def run(self, argv=None):
         """Execute the CLI application."""
-        options = self.__argparse.parse_args(argv)
+        argv = sys.argv[1:] if argv is None else list(argv)
+        if self.__watcher is not None and self.__watcher.changed():
+            self.__reload_watched()
+        stages = [[]]
+        for arg in argv:
+            if arg == PIPE_SEPARATOR:
+                stages.append([])
+            else:
+                stages[-1].append(arg)
+        if argv == ["--shell"] and self.__description.get("shell"):
+            return self.shell()
+        return self.pipeline(stages)
+
+    def shell(self, stdin=None, stdout=None):
+        """Execute command lines interactively, until end of input."""
+        from .shell import Shell
+
+        Shell(self, self.__description, stdin=stdin, stdout=stdout).cmdloop()
+
+    def pipeline(self, stages):
+        """Execute commands in sequence, piping the handlers results."""
+        async_cfg = self.__description.get("async_output")
+        if not async_cfg:
+            return self.__pipeline(stages)
+        from .writer import AsyncWriter
+
+        if not isinstance(async_cfg, dict):
+            async_cfg = {}
+        stream = self.output_stream
+        self.output_stream = AsyncWriter(
+            stream, queue_size=async_cfg.get("queue_size", 1024)
+        )
+        try:
+            return self.__pipeline(stages)
+        finally:
+            try:
+                self.output_stream.close()
+            finally:
+                self.output_stream = stream
+
+    def __pipeline(self, stages):
+        result = None
+        for index, argv in enumerate(stages):
+            render = index == len(stages) - 1
+            result = self.__run_stage(argv, index > 0, result, render)
+        return result
+
+    def __run_stage(self, argv, piped, result, render):
+        """Execute a command, measuring it if metrics or tracing are on."""
+        recorders = [
+            recorder
+            for recorder in [self.metrics, self.tracer]
+            if recorder is not None and recorder.sampled()
+        ]
+        if not recorders:
+            self.__timer = None
+            return self.__stage(argv, piped, result, render)
+        from .metrics import Timer
+
+        self.__timer = Timer(list(argv), piped)
+        try:
+            result = self.__stage(argv, piped, result, render)
+        except BaseException as exc:
+            for recorder in recorders:
+                recorder.record(self.__timer, exc)
+            raise
+        for recorder in recorders:
+            recorder.record(self.__timer)
+        return result
+
+    def __stage(self, argv, piped, result, render):
+        with self.__phase("parse"):
+            command, args = self.__parse(argv)
+        if piped:
+            if command.pipe is None:
+                raise ValueError(f"Handler `{command.handler}` has no pipe.")
+            args[command.pipe] = result
+        output_file = args.pop("_cli_output_file", None)
+        if not self.use_output_files:
+            output_file = None
+        with self.__phase("handler"):
+            if output_file is None or not render:
+                return self.__execute(command, args, render)
+            return self.__execute_to_file(output_file, command, args)
+
+    def __execute_to_file(self, filename, command, args):
+        """Execute a command, writing its output to a file."""
+        from .outfile import open_output_file
+
+        stream = self.output_stream
+        try:
+            with open_output_file(filename) as self.output_stream:
+                return self.__execute(command, args, True)
+        finally:
+            self.output_stream = stream
+
+    def __phase(self, name):
+        if self.__timer is None:
+            from contextlib import nullcontext
+
+            return nullcontext()
+        return self.__timer.phase(name)
+
+    def __parse(self, argv):
+        """Parse command line arguments, returning handler and arguments."""
+        self.__display_version(argv)
+        self.__display_cached_help(argv)
+        options = self.__get_parser().parse_args(argv)
         args = vars(options)
+        if args.pop("_cli_shell", False):
+            self.__argparse.error("--shell cannot be used with other arguments")
         self.configuration = Object()
         for cfg in self.__non_parameters:
             if cfg in args:
                 setattr(self.configuration, cfg, args[cfg])
                 del args[cfg]
+        command = self.__get_command_from(args)
+        if self.__timer is not None:
+            self.__timer.command = (
+                " ".join(command.path) or self.__description["program"]
+            )
+        return command, args
 
-        method_name = self.__commands[self.__get_method_name_from(args)]
-        output = self.__output[method_name]
-
-        # execute function
-        *module, function = method_name.split(".")
-        mod = importlib.import_module(".".join(module))
-        handler = getattr(mod, function)
+    def __execute(self, command, args, render):
+        if self.__is_fan_out(command, args):
+            return self.__fan_out_call(command, args, render)
         try:
-            result = handler(**args)
+            result = self.__cached_call(command, args)
         except Exception as exc:  # pylint: disable=broad-except
-            if "exceptions" in self.__description:
-                self.__process_exception(exc, self.__description["exceptions"])
-            raise exc from None
+            self.__raise_exception(exc)
+        if render:
+            self.__render(command, result)
+        return result
+
+    def __raise_exception(self, exc):
+        if self.__timer is not None:
+            self.__timer.exception = exc
+        if "exceptions" in self.__description:
+            self.__process_exception(exc, self.__description["exceptions"])
+        raise exc from None
+
+    def __render(self, command, result):
+        output = command.output
+        if output:
+            if isinstance(output, bool):
+                output = {}
+            with self.__phase("render"):
+                self.__display_result(result, output)
+
+    def __display_result(self, result, output):
+        """Display a result, writing binary results as they are."""
+        if isinstance(result, (bytes, bytearray, memoryview)):
+            from .passthrough import write_bytes
+
+            write_bytes(self.output_stream, result)
+        elif isinstance(output, dict) and output.get("passthrough") == "file":
+            from .passthrough import copy_file
+
+            if result is not None:
+                copy_file(self.output_stream, result)
         else:
-            if output:
-                if isinstance(output, bool):
-                    output = {}
-                self.__display(result, level=0, format_cfg=output)
-            return result
-        return None
-
-    def __get_method_name_from(self, args):
-        method_name = args.get("_cli_command", self.__description["program"])
-        if "_cli_command" in args:
-            del args["_cli_command"]
-        if not method_name:
-            raise Exception("Method name not defined.")
-        if method_name not in self.__commands:
-            raise Exception(f"Invalid command: {method_name}.")
-        return method_name
+            self.__display(result, format_cfg=output)
+
+    def __is_fan_out(self, command, args):
+        """Check if the fan out argument, if any, has multiple values."""
+        if command.fan_out is None:
+            return False
+        name, _ = command.fan_out
+        values = args.get(name)
+        if isinstance(values, (list, tuple)) and len(values) <= 1:
+            args[name] = values[0] if values else None
+            return False
+        return isinstance(values, (list, tuple)) or hasattr(values, "__next__")
+
+    def __fan_out_call(self, command, args, render):
+        """Call the handler once for each value of the fan out argument."""
+        from .fanout import fan_out
+
+        name, fan_out_cfg = command.fan_out
+        values = args.pop(name)
+        results = []
+        failed = False
+        # with the `process` executor the command is isolated, and threads
+        # dispatch the values to its pool of worker processes.
+        for value, future in fan_out(
+            self.__fan_out_function(command, args, name),
+            values,
+            workers=fan_out_cfg.get("workers", 4),
+            ordered=fan_out_cfg.get("ordered", True),
+        ):
+            try:
+                result = future.result()
+            except Exception as exc:  # pylint: disable=broad-except
+                if fan_out_cfg.get("on_error", "raise") == "raise":
+                    self.__raise_exception(exc)
+                print(f"ERROR: {value}: {exc}", file=sys.stderr)
+                failed = True
+                continue
+            results.append(result)
+            if render:
+                self.__render(command, result)
+        if failed:
+            sys.exit(1)
+        return results
+
+    def __display_version(self, argv):
+        """Display the program version without creating any parser."""
+        if self.__version is not None and argv == ["--version"]:
+            print(f"{self.__description['program']} {self.__version}")
+            sys.exit(0)
+
+    def __display_cached_help(self, argv):
+        """Display help from the help cache, if `argv` requests help."""
+        if self.__help_cache is None or argv[-1:] not in [["-h"], ["--help"]]:
+            return
+        command = self.__commands.find(argv[:-1])
+        if command is None:
+            return
+        text = self.__help_cache.get(command.path)
+        if text is None:
+            self.__get_parser()
+            text = command.parser.format_help()
+            self.__help_cache.set(command.path, text)
+        sys.stdout.write(text)
+        sys.exit(0)
+
+    def __cached_call(self, command, args):
+        """Call the handler, unless a cached result is available."""
+        no_cache = args.pop("_cli_no_cache", False)
+        refresh = args.pop("_cli_refresh_cache", False)
+        cache = command.cache
+        if cache is None or no_cache or not self.use_cache:
+            return self.__call_handler(command, args)
+        key = cache.key(command.handler, args)
+        if not refresh:
+            hit, result = cache.get(key)
+            if hit:
+                return result
+        result = self.__call_handler(command, args)
+        cache.set(key, result)
+        return result
+
+    def __fan_out_function(self, command, args, name):
+        def call_cached(value):
+            return self.__cached_call(command, dict(args, **{name: value}))
+
+        return call_cached
+
+    def __load_handler(self, method_name):
+        from .execution import load_handler
+
+        return (self.handler_loader or load_handler)(method_name)
+
+    def __call_handler(self, command, args):
+        if command.isolated:
+            return self.__worker_pool(command).call(
+                command.handler,
+                args,
+                command.progress,
+                command.timeout,
+                self.handler_loader,
+            )
+        from .execution import call_handler
+
+        handler = self.__load_handler(command.handler)
+        return call_handler(handler, args, command.progress)
+
+    def __worker_pool(self, command):
+        """Get the worker pool for the resource limits of a command."""
+        from .execution import WorkerPool
+
+        workers = 1
+        if command.fan_out is not None:
+            workers = command.fan_out[1].get("workers", 4)
+        key = (command.max_memory, workers)
+        if key not in self.__pools:
+            self.__pools[key] = WorkerPool(workers, command.max_memory)
+        return self.__pools[key]
+
+    def __get_command_from(self, args):
+        path = []
+        while f"_cli_command_{len(path)}" in args:
+            name = args.pop(f"_cli_command_{len(path)}")
+            if name is None:
+                break
+            path.append(name)
+        command = self.__commands.find(path)
+        if not command.handler:
+            if command.children:
+                raise Exception("Method name not defined.")
+            raise Exception(f"Invalid command: {' '.join(path)}.")
+        return command
 
     def __process_exception(self, exc, exceptions):
         """Process exception to provide user defined behavior."""
+        import itertools
+        import traceback
+
         exc_names = [n.__name__ for n in type(exc).mro()]
         exceptions = self.__description["exceptions"]
         candidates = [
@@ -166,11 +621,14 @@ class CLIDesc:
         # if not raising, program will end.
         error_msg = exception.get("message", "ERROR: {exception}")
         print(error_msg.format(exception=exc), file=self.output_stream)
+        self.output_stream.flush()
         if action == "traceback":
             traceback.print_tb(exc.__traceback__)
         sys.exit(exit_code if "exit_code" in exception else 1)
 
     def __add_argument(self, parser, argument):
+        from . import argtypes
+
         default = argument.get("default")
         store_selector = {
             True: "store_false",
@@ -186,17 +644,25 @@ class CLIDesc:
             "boolean": (bool, store_selector[bool(default)]),
             "bool": (bool, store_selector[bool(default)]),
         }
+        mode = argument.get("mode", "r")
+        arg_type.update(
+            {
+                kind: (argtypes.FileType(kind, mode), "store")
+                for kind in argtypes.FILE_TYPES
+            }
+        )
         extra_args = {}
 
         description = argument["description"]
-        required = argument.get("required", False)
+        # piped arguments may be provided by the previous pipeline stage.
+        required = argument.get("required", False) and not argument.get("pipe")
         optional = argument.get("optional")
 
         datatype, action = arg_type.get(argument.get("type", "str"))
 
         extra_args["action"] = action
         if default or action == "count":
-            extra_args["default"] = datatype(default) if default else 0
+            extra_args["default"] = self.__default_value(datatype, default)
 
         if optional:
             names = [f"--{argument['name']}"]
@@ -214,7 +680,7 @@ class CLIDesc:
             names = [argument["name"]]
 
         if argument.get("type") not in ["count", "bool", "boolean"]:
-            extra_args["type"] = datatype
+            extra_args.update(self.__type_args(argument, datatype))
 
         if "nargs" in argument:
             extra_args["nargs"] = argument["nargs"]
@@ -222,50 +688,119 @@ class CLIDesc:
             extra_args["choices"] = argument["choices"]
 
         if argument.get("configuration"):
-            self.__non_parameters.append(
-                names[0][re.search(r"[^-]", names[0]).start() :]
-            )
+            self.__non_parameters.append(names[0].lstrip("-"))
 
         parser.add_argument(*names, help=description, **extra_args)
 
-    def __display(self, data, level, format_cfg, parent=None):
+    @staticmethod
+    def __type_args(argument, datatype):
+        from .argtypes import ArrayAction, ResponseFileAction
+
+        container = argument.get("container")
+        if container is not None:
+            if container not in ["array", "numpy"]:
+                raise ValueError(f"Invalid argument container: {container}")
+            return {
+                "action": ArrayAction,
+                "datatype": datatype,
+                "array_kind": container,
+                "response_files": argument.get("response_files", False),
+            }
+        if argument.get("response_files"):
+            return {
+                "action": ResponseFileAction,
+                "datatype": datatype,
+                "lazy": argument.get("lazy", False),
+            }
+        return {"type": datatype}
+
+    @staticmethod
+    def __default_value(datatype, default):
+        from .argtypes import FileType
+
+        if isinstance(datatype, FileType):
+            # file defaults are converted by argparse, only when used.
+            return default
+        return datatype(default) if default else 0
+
+    def __display(self, data, format_cfg):
         """Display the result of the API command."""
         if not isinstance(format_cfg, (str, dict)):
-            raise TypeError(f"Invalid format type: {type(format).__name__}")
-
-        display_opts = self.__get_display_opts(level, format_cfg, parent)
+            raise TypeError(f"Invalid format type: {type(format_cfg).__name__}")
+        if data is None:
+            return
+        cursor = self.__format_cursor(format_cfg)
+        display_opts = self.__get_display_opts(format_cfg, 0, cursor)
         if isinstance(format_cfg, str):
             print(
                 format_cfg.format(**data, **display_opts),
                 file=self.output_stream,
             )
+        elif isinstance(data, dict):
+            self.__display_dict(data, format_cfg, cursor, display_opts)
+        elif isinstance(data, (list, set, tuple)):
+            self.__display_list(list(data), display_opts, "")
         else:
-            if isinstance(data, (str, int)):
-                print(data, file=self.output_stream)
-            elif isinstance(data, list):
-                self.__display_list(data, display_opts, parent or "")
+            print(data, file=self.output_stream)
+
+    def __display_dict(self, data, format_cfg, cursor, display_opts):
+        """Display nested dictionaries, using an explicit stack."""
+        # Each stack frame holds an iterator over the items of a dictionary
+        # being displayed, its level, format cursor and display options.
+        # `path` holds the keys of the dictionaries in the stack, and `active`
+        # their ids, to detect cycles (a dict, as an ordered set).
+        stack = [(iter(data.items()), 0, cursor, display_opts)]
+        path = []
+        active = {id(data): None}
+        while stack:
+            items, level, cursor, display_opts = stack[-1]
+            try:
+                key, value = next(items)
+            except StopIteration:
+                stack.pop()
+                active.popitem()
+                if stack:
+                    path.pop()
+                continue
+            disp_key, fmt = self.__get_display_key(format_cfg, key)
+            if not isinstance(value, (list, set, dict, tuple)):
+                self.__display_value(key, value, disp_key, fmt, display_opts)
+                continue
+            inc = 0
+            if disp_key:
+                print(
+                    f"{display_opts['_pad']}{disp_key}",
+                    file=self.output_stream,
+                )
+                inc = 1
+            cursor = self.__format_cursor(format_cfg, cursor, key)
+            display_opts = self.__get_display_opts(
+                format_cfg, level + inc, cursor
+            )
+            if not isinstance(value, dict):
+                self.__display_list(
+                    list(value),
+                    display_opts,
+                    ".".join(str(k) for k in path + [key]),
+                )
+            elif id(value) in active:
+                print(f"{display_opts['_pad']}{{...}}", file=self.output_stream)
             else:
-                for _key, _value in data.items():
-                    _parent = parent.split(".") if parent else []
-                    element = ".".join(_parent + [_key])
-                    disp_key, fmt = self.__get_display_key(format_cfg, _key)
-                    if isinstance(_value, (list, set, dict, tuple)):
-                        inc = 0
-                        if disp_key:
-                            print(
-                                f"{display_opts['_pad']}{disp_key}",
-                                file=self.output_stream,
-                            )
-                            inc = 1
-                        self.__display(_value, level + inc, format_cfg, element)
-                    else:
-                        print(disp_key, end=" ", file=self.output_stream)
-                        if fmt:
-                            keys = {_key: _value}
-                            keys.update(display_opts)
-                            print(fmt.format(**keys), file=self.output_stream)
-                        else:
-                            print(_value, file=self.output_stream)
+                stack.append(
+                    (iter(value.items()), level + inc, cursor, display_opts)
+                )
+                path.append(key)
+                active[id(value)] = None
+
+    def __display_value(self, key, value, disp_key, fmt, display_opts):
+        """Display a key with a scalar value."""
+        print(disp_key, end=" ", file=self.output_stream)
+        if fmt:
+            keys = {key: value}
+            keys.update(display_opts)
+            print(fmt.format(**keys), file=self.output_stream)
+        else:
+            print(value, file=self.output_stream)
 
     @staticmethod
     def __get_display_key(format_cfg, key):
@@ -318,30 +853,46 @@ class CLIDesc:
             print(text, file=self.output_stream)
 
     @staticmethod
-    def __get_display_opts(level, format_cfg, parent):
-        # get formatting options
+    def __format_cursor(format_cfg, cursor=None, key=None):
+        """
+        Move the output configuration cursor to the configuration for `key`.
+
+        A cursor is a tuple with the current output configuration, the
+        `colorize` setting, and if the configuration still follows the path
+        of displayed keys.
+        """
+        if cursor is None:
+            colorize = isinstance(format_cfg, dict) and format_cfg.get(
+                "colorize", False
+            )
+            return (format_cfg, colorize, True)
+        node, colorize, following = cursor
+        if not following or not isinstance(node, dict) or key not in node:
+            return (node, colorize, False)
+        node = node[key]
+        if isinstance(node, dict):
+            colorize = node.get("colorize", colorize)
+        return (node, colorize, True)
+
+    def __get_display_opts(self, format_cfg, level, cursor):
+        _fmt, colorize, _ = cursor
         if isinstance(format_cfg, str):
-            _fmt = {"format": format_cfg}
+            _pad_size = 4
         else:
-            _fmt = format_cfg
-        _pad_size = _fmt.get("padding", 4)
-        colorize = _fmt.get("colorize", False)
-        if parent:
-            for _elem in parent.split("."):
-                if _elem in _fmt:
-                    _fmt = _fmt[_elem]
-                    if "colorize" in _fmt:
-                        colorize = _fmt["colorize"]
-                else:
-                    break
-            if isinstance(_fmt, str):
-                _fmt = {"format": _fmt}
+            _pad_size = format_cfg.get("padding", 4)
+        if isinstance(_fmt, str):
+            _fmt = {"format": _fmt}
+        elif not isinstance(_fmt, dict):
+            _fmt = {}
         display_opts = {
             "_pad": (" " * (_pad_size * level)) if _pad_size else "",
             "__format": _fmt.get("format"),
             "__no_key": _fmt.get("no_key", False),
         }
-        display_opts.update(CLIDesc._ansi_color_theme(colorize))
+        colorize = bool(colorize)
+        if colorize not in self.__themes:
+            self.__themes[colorize] = CLIDesc._ansi_color_theme(colorize)
+        display_opts.update(self.__themes[colorize])
         if "enumerate" in _fmt:
             display_opts["__enumerate"] = _fmt["enumerate"]
         return display_opts
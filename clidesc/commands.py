@@ -0,0 +1,112 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Trie of commands, indexed by command path."""
+
+
+class Command:  # pylint: disable=too-many-instance-attributes
+    """Node of the command trie, with the configuration of a command."""
+
+    def __init__(self, path, cmd_description):
+        """Initialize the command at `path` from its description."""
+        self.path = path
+        self.description = cmd_description
+        self.handler = cmd_description.get("handler")
+        self.output = cmd_description.get("output")
+        self.pipe = None
+        self.fan_out = None
+        for argument in cmd_description.get("arguments", []):
+            name = argument["name"].replace("-", "_")
+            if argument.get("pipe"):
+                self.pipe = name
+            if argument.get("fan_out"):
+                fan_out_cfg = argument["fan_out"]
+                if not isinstance(fan_out_cfg, dict):
+                    fan_out_cfg = {}
+                self.fan_out = (name, fan_out_cfg)
+        self.progress = None
+        progress_cfg = cmd_description.get("progress")
+        if progress_cfg:
+            if not isinstance(progress_cfg, dict):
+                progress_cfg = {}
+            self.progress = (progress_cfg.get("name", "progress"), progress_cfg)
+        self.timeout = cmd_description.get("timeout")
+        self.max_memory = cmd_description.get("max_memory")
+        isolate = cmd_description.get("isolate")
+        if isolate not in [None, False, "process"]:
+            raise ValueError(f"Invalid isolate value: {isolate}")
+        if self.fan_out is not None:
+            executor = self.fan_out[1].get("executor", "thread")
+            if executor not in ["thread", "process"]:
+                raise ValueError(f"Invalid fan_out executor: {executor}")
+            isolate = isolate or executor == "process"
+        # handlers can only be killed, or limited, in other processes.
+        self.isolated = bool(isolate or self.timeout or self.max_memory)
+        self.cache = None
+        self.parser = None
+        self.subparser = None
+        self.children = {}
+        self.__validate()
+
+    def __validate(self):
+        """Reject combinations of attributes that cannot be used together."""
+        arguments = self.description.get("arguments", [])
+        if self.description.get("cache") and any(
+            argument.get("lazy") and argument.get("response_files")
+            for argument in arguments
+        ):
+            raise ValueError(
+                f"Handler `{self.handler}` cannot cache results of lazy"
+                " arguments."
+            )
+
+    @property
+    def aliases(self):
+        """List the alternative names of the command."""
+        return list(self.description.get("aliases", []))
+
+    def add(self, child):
+        """Add, or replace, a sub command, indexed by name and aliases."""
+        previous = self.children.get(child.path[-1])
+        if previous is not None:
+            for name in [n for n, c in self.children.items() if c is previous]:
+                del self.children[name]
+        for name in [child.path[-1]] + child.aliases:
+            self.children[name] = child
+
+    def find(self, path):
+        """Find the command for a path of names or aliases, or None."""
+        command = self
+        for name in path:
+            command = command.children.get(name)
+            if command is None:
+                return None
+        return command
+
+
+def build_command_trie(cmd_description, path=()):
+    """Build the trie of commands from a (sub) command description."""
+    root = Command(path, cmd_description)
+    stack = [root]
+    while stack:
+        command = stack.pop()
+        sub_commands = command.description.get("sub_commands") or {}
+        for sub_command in sub_commands.get("commands") or []:
+            child = Command(command.path + (sub_command["name"],), sub_command)
+            command.add(child)
+            stack.append(child)
+    return root
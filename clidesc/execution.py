@@ -0,0 +1,186 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Execution of command handlers, in-process or in worker processes."""
+
+# pylint: disable=import-outside-toplevel
+
+import importlib
+from importlib.util import find_spec
+from contextlib import ExitStack
+
+from .argtypes import open_file_arguments
+
+SIZE_UNITS = {"K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def load_handler(handler_name):
+    """Import a handler given as `module.function`."""
+    *module, function = handler_name.split(".")
+    mod = importlib.import_module(".".join(module))
+    return getattr(mod, function)
+
+
+def call_handler(handler, args, progress=None):
+    """Call a handler, opening its file arguments and progress reporter."""
+    with ExitStack() as stack:
+        open_file_arguments(args, stack)
+        if progress is not None:
+            from .progress import create_progress
+
+            name, progress_cfg = progress
+            args[name] = stack.enter_context(create_progress(progress_cfg))
+        return handler(**args)
+
+
+def memory_size(size):
+    """Convert a size, in bytes or with a K, M or G suffix, to bytes."""
+    if isinstance(size, str) and size[-1:].upper() in SIZE_UNITS:
+        return int(float(size[:-1]) * SIZE_UNITS[size[-1].upper()])
+    return int(size)
+
+
+def limit_resources(max_memory):
+    """Limit the resources of the current (worker) process."""
+    if max_memory is not None:
+        import resource
+
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory, max_memory))
+
+
+def call_isolated(handler_name, args, progress, loader=None):
+    """Load and call a handler, in a worker process."""
+    handler = (loader or load_handler)(handler_name)
+    return call_handler(handler, args, progress)
+
+
+def _serve(connection, max_memory):
+    """Execute the handler calls received by a worker process."""
+    limit_resources(max_memory)
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        try:
+            response = (True, call_isolated(*request))
+        except Exception as exc:  # pylint: disable=broad-except
+            response = (False, exc)
+        try:
+            connection.send(response)
+        except Exception as exc:  # pylint: disable=broad-except
+            # the result, or the exception, cannot be pickled.
+            connection.send((False, exc))
+
+
+class _Worker:
+    """A worker process, executing one handler call at a time."""
+
+    def __init__(self, max_memory):
+        """Start the worker process."""
+        import multiprocessing
+
+        self.connection, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_serve, args=(child, max_memory), daemon=True
+        )
+        self.process.start()
+        child.close()
+
+    def call(self, request, timeout):
+        """Send a request, and wait at most `timeout` for the response."""
+        self.connection.send(request)
+        if not self.connection.poll(timeout):
+            raise TimeoutError()
+        return self.connection.recv()
+
+    def kill(self):
+        """Kill the worker process."""
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class WorkerPool:
+    """Pool of worker processes with resource limits, reused across calls."""
+
+    def __init__(self, workers=1, max_memory=None):
+        """Initialize the pool, without starting any process."""
+        import threading
+
+        if max_memory is not None:
+            max_memory = memory_size(max_memory)
+            if find_spec("resource") is None:
+                raise ValueError("`max_memory` is not supported.")
+        self.workers = workers
+        self.max_memory = max_memory
+        self.__idle = []
+        self.__lock = threading.Lock()
+        self.__slots = threading.BoundedSemaphore(workers)
+
+    def call(
+        self, handler_name, args, progress=None, timeout=None, loader=None
+    ):  # pylint: disable=too-many-arguments
+        """
+        Call a handler in a worker process, waiting at most `timeout`.
+
+        The handler is loaded by `loader`, if given, which must be picklable.
+        At most `workers` calls, from different threads, run concurrently.
+
+        Raise TimeoutError if the handler does not finish in time, after
+        killing its worker process, and ChildProcessError if the worker
+        process dies. Killed worker processes are replaced on later calls.
+        """
+        with self.__slots:
+            worker = self.__acquire()
+            try:
+                success, result = worker.call(
+                    (handler_name, args, progress, loader), timeout
+                )
+            except TimeoutError:
+                worker.kill()
+                raise TimeoutError(
+                    f"Handler `{handler_name}` timed out after {timeout}"
+                    " seconds."
+                ) from None
+            except (EOFError, OSError):
+                worker.kill()
+                raise ChildProcessError(
+                    f"Worker process of handler `{handler_name}` died."
+                ) from None
+            except BaseException:
+                worker.kill()
+                raise
+            with self.__lock:
+                self.__idle.append(worker)
+        if not success:
+            raise result
+        return result
+
+    def __acquire(self):
+        """Get an idle worker, or start a new one."""
+        with self.__lock:
+            if self.__idle:
+                return self.__idle.pop()
+        return _Worker(self.max_memory)
+
+    def terminate(self):
+        """Kill the idle worker processes."""
+        with self.__lock:
+            idle, self.__idle = self.__idle, []
+        for worker in idle:
+            worker.kill()
@@ -0,0 +1,55 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Execute a handler over many argument values in parallel."""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+def _next_done(pending, ordered):
+    if ordered:
+        return pending.popleft()
+    futures = [future for _, future in pending]
+    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+    for item in pending:
+        if item[1] in done:
+            pending.remove(item)
+            return item
+    raise RuntimeError("No completed future.")  # pragma: no cover
+
+
+def fan_out(function, values, workers=4, ordered=True):
+    """
+    Call `function(value)` for each value, using a pool of worker threads.
+
+    Yield a tuple (value, future) for each value, in the order of the values
+    if `ordered` is true, or in the order they complete, otherwise. At most
+    twice the number of workers values are submitted ahead of the results.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        try:
+            for value in values:
+                pending.append((value, pool.submit(function, value)))
+                if len(pending) >= 2 * workers:
+                    yield _next_done(pending, ordered)
+            while pending:
+                yield _next_done(pending, ordered)
+        finally:
+            for _, future in pending:
+                future.cancel()
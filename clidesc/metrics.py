@@ -0,0 +1,174 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Collection of command latency and error metrics."""
+
+import os
+import time
+import random
+from contextlib import contextmanager
+
+PHASES = ["parse", "handler", "render"]
+BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+
+
+class Timer:  # pylint: disable=too-few-public-methods
+    """Measure the duration of the phases of a command execution."""
+
+    def __init__(self, argv=None, piped=False):
+        """Initialize timer for the command line `argv`."""
+        self.argv = argv
+        self.piped = piped
+        self.command = None
+        self.exception = None
+        self.phases = dict.fromkeys(PHASES, 0.0)
+
+    @contextmanager
+    def phase(self, name):
+        """Measure the duration of a phase, accumulating its time."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.perf_counter() - start
+
+    def durations(self):
+        """Get the duration of each phase, excluding nested phases."""
+        # render time is measured while the handler phase is active.
+        phases = dict(self.phases)
+        phases["handler"] = max(0.0, phases["handler"] - phases["render"])
+        return phases
+
+
+def exit_code_for(exception):
+    """Compute the process exit code caused by an exception (or None)."""
+    if exception is None:
+        return 0
+    if isinstance(exception, SystemExit):
+        code = exception.code
+        return code if isinstance(code, int) else (0 if code is None else 1)
+    return 1
+
+
+def error_name(timer, exception):
+    """Get the name of the exception raised by a command (or None)."""
+    # handler exceptions may have been converted to SystemExit.
+    error = timer.exception
+    if error is None and not isinstance(exception, SystemExit):
+        error = exception
+    return type(error).__name__ if error is not None else None
+
+
+class Metrics:
+    """Aggregate command execution metrics, optionally writing to a file."""
+
+    def __init__(self, filename=None, fmt=None, sample=1.0):
+        """Initialize metrics output file, format and sampling rate."""
+        self.filename = os.path.expanduser(filename) if filename else None
+        if fmt is None and filename:
+            fmt = "jsonl" if filename.endswith(".jsonl") else "openmetrics"
+        self.format = fmt
+        self.sample = sample
+        self.durations = {}
+        self.errors = {}
+        self.exit_codes = {}
+
+    def sampled(self):
+        """Decide if the next command execution must be measured."""
+        return self.sample >= 1 or random.random() < self.sample
+
+    def record(self, timer, exception=None):
+        """Record the measurements of a command execution."""
+        command = timer.command or ""
+        phases = timer.durations()
+        for phase, duration in phases.items():
+            histogram = self.durations.setdefault(
+                (command, phase), [0] * (len(BUCKETS) + 1) + [0.0]
+            )
+            index = next(
+                (i for i, le in enumerate(BUCKETS) if duration <= le),
+                len(BUCKETS),
+            )
+            histogram[index] += 1
+            histogram[-1] += duration
+        exit_code = exit_code_for(exception)
+        key = (command, exit_code)
+        self.exit_codes[key] = self.exit_codes.get(key, 0) + 1
+        error = error_name(timer, exception)
+        if error is not None:
+            key = (command, error)
+            self.errors[key] = self.errors.get(key, 0) + 1
+        if self.filename is None:
+            return
+        if self.format == "jsonl":
+            self.__append_jsonl(command, phases, error, exit_code)
+        elif self.format == "openmetrics":
+            self.write_openmetrics()
+
+    def __append_jsonl(self, command, phases, error, exit_code):
+        import json  # pylint: disable=import-outside-toplevel
+
+        record = {
+            "time": time.time(),
+            "command": command,
+            **phases,
+            "exception": error,
+            "exit_code": exit_code,
+        }
+        with open(self.filename, "a") as metrics_file:
+            metrics_file.write(json.dumps(record) + "\n")
+
+    def openmetrics(self):
+        """Format the aggregated metrics as OpenMetrics text."""
+        metric = "clidesc_command_duration_seconds"
+        lines = [f"# TYPE {metric} histogram"]
+        for (command, phase), histogram in sorted(self.durations.items()):
+            labels = f'command="{command}",phase="{phase}"'
+            count = 0
+            for le, observed in zip(BUCKETS + ["+Inf"], histogram):
+                count += observed
+                lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f"{metric}_sum{{{labels}}} {histogram[-1]}")
+            lines.append(f"{metric}_count{{{labels}}} {count}")
+        lines.append("# TYPE clidesc_command_errors counter")
+        for (command, exc), count in sorted(self.errors.items()):
+            labels = f'command="{command}",exception="{exc}"'
+            lines.append(f"clidesc_command_errors_total{{{labels}}} {count}")
+        lines.append("# TYPE clidesc_command_exits counter")
+        for (command, code), count in sorted(self.exit_codes.items()):
+            labels = f'command="{command}",exit_code="{code}"'
+            lines.append(f"clidesc_command_exits_total{{{labels}}} {count}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_openmetrics(self):
+        """Write the aggregated metrics to the metrics file."""
+        tmpname = f"{self.filename}.{os.getpid()}"
+        with open(tmpname, "w") as metrics_file:
+            metrics_file.write(self.openmetrics())
+        os.replace(tmpname, self.filename)
+
+
+def create_metrics(metrics_cfg):
+    """Create a Metrics object from the `metrics` configuration."""
+    if not isinstance(metrics_cfg, dict):
+        metrics_cfg = {}
+    return Metrics(
+        metrics_cfg.get("file"),
+        metrics_cfg.get("format"),
+        metrics_cfg.get("sample", 1.0),
+    )
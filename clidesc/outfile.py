@@ -0,0 +1,57 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Output files, compressed according to their extension."""
+
+import io
+import os
+
+BUFFER_SIZE = 1024 * 1024
+
+
+def _open_compressed(filename):
+    """Open a binary file, compressed according to its extension."""
+    # pylint: disable=import-outside-toplevel
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".gz":
+        import gzip
+
+        return gzip.open(filename, "wb", compresslevel=6)
+    if extension == ".bz2":
+        import bz2
+
+        return bz2.open(filename, "wb")
+    if extension in [".xz", ".lzma"]:
+        import lzma
+
+        return lzma.open(filename, "wb")
+    return open(filename, "wb")  # pylint: disable=consider-using-with
+
+
+def open_output_file(filename, encoding="utf-8"):
+    """
+    Open a text file for writing, compressed according to its extension.
+
+    Files ending with `.gz`, `.bz2`, `.xz` or `.lzma` are compressed with
+    gzip, bzip2 or LZMA, respectively, as the text is written. Writes are
+    buffered in large blocks, to reduce the number of calls to the
+    compressor.
+    """
+    binary = _open_compressed(os.path.expanduser(filename))
+    return io.TextIOWrapper(
+        io.BufferedWriter(binary, buffer_size=BUFFER_SIZE), encoding=encoding
+    )
@@ -0,0 +1,94 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Output of binary handler results, bypassing output formatting."""
+
+import io
+import os
+import errno
+import codecs
+import shutil
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _binary_buffer(stream):
+    """Flush a text stream, and return its binary buffer, if any."""
+    stream.flush()
+    return getattr(stream, "buffer", None)
+
+
+def _decoder(stream):
+    encoding = getattr(stream, "encoding", None) or "utf-8"
+    return codecs.getincrementaldecoder(encoding)(errors="replace")
+
+
+def write_bytes(stream, data):
+    """Write binary data to the buffer of a text stream."""
+    buffer = _binary_buffer(stream)
+    if buffer is None:
+        stream.write(_decoder(stream).decode(bytes(data), final=True))
+    else:
+        buffer.write(data)
+        buffer.flush()
+
+
+def _sendfile(source, buffer):
+    """Copy a file with `os.sendfile`, returning False if not supported."""
+    # only plain files can be written to, without the (e.g. compressing)
+    # layers between the buffer and its file descriptor.
+    if not hasattr(os, "sendfile") or not isinstance(
+        getattr(buffer, "raw", buffer), io.FileIO
+    ):
+        return False
+    try:
+        in_fd, out_fd = source.fileno(), buffer.fileno()
+        offset = start = source.tell()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return False
+    while True:
+        try:
+            sent = os.sendfile(out_fd, in_fd, offset, CHUNK_SIZE)
+        except OSError as exc:
+            unsupported = (errno.EINVAL, errno.ENOSYS, errno.ENOTSOCK)
+            if offset == start and exc.errno in unsupported:
+                return False
+            raise
+        if sent == 0:
+            break
+        offset += sent
+    source.seek(offset)
+    return True
+
+
+def copy_file(stream, source):
+    """Copy a file, given by path or file object, to a text stream."""
+    if isinstance(source, (str, os.PathLike)):
+        source = open(source, "rb")  # pylint: disable=consider-using-with
+    with source:
+        if isinstance(source, io.TextIOBase):
+            shutil.copyfileobj(source, stream, CHUNK_SIZE)
+            return
+        buffer = _binary_buffer(stream)
+        if buffer is None:
+            decoder = _decoder(stream)
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                stream.write(decoder.decode(chunk))
+            stream.write(decoder.decode(b"", final=True))
+        elif not _sendfile(source, buffer):
+            shutil.copyfileobj(source, buffer, CHUNK_SIZE)
+            buffer.flush()
@@ -0,0 +1,102 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Discovery of plugin commands through package entry points."""
+
+import os
+import sys
+import json
+import hashlib
+
+try:
+    from importlib import metadata
+except ImportError:  # pragma: no cover
+    import importlib_metadata as metadata
+
+from .cache import default_cache_dir
+
+
+def _entry_points(group):
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return entry_points.select(group=group)
+    return entry_points.get(group, [])  # pragma: no cover
+
+
+def fingerprint(group):
+    """Compute a fingerprint of the installed packages on `sys.path`."""
+    digest = hashlib.sha256(group.encode("utf-8"))
+    for path in sys.path:
+        try:
+            mtime = os.stat(path or ".").st_mtime_ns
+        except OSError:
+            continue
+        digest.update(f"{path}:{mtime}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def discover_commands(group):
+    """Load command descriptions from the entry points in `group`."""
+    commands = []
+    for entry_point in sorted(_entry_points(group), key=lambda e: e.name):
+        command = entry_point.load()
+        if callable(command):
+            command = command()
+        if isinstance(command, dict):
+            command = [command]
+        commands.extend(command)
+    return commands
+
+
+def load_plugin_commands(program, plugins_cfg):
+    """Load plugin commands, using the cached command index if valid."""
+    if isinstance(plugins_cfg, str):
+        plugins_cfg = {"group": plugins_cfg}
+    group = plugins_cfg["group"]
+    cache = plugins_cfg.get("cache", True)
+    if not cache:
+        return discover_commands(group)
+    if not isinstance(cache, str):
+        cache = default_cache_dir(program, f"{group}.json")
+    cache = os.path.expanduser(cache)
+    current = fingerprint(group)
+    try:
+        with open(cache, "r") as index_file:
+            index = json.load(index_file)
+        if index.get("fingerprint") == current:
+            return index["commands"]
+    except (OSError, ValueError):
+        pass
+    commands = discover_commands(group)
+    os.makedirs(os.path.dirname(cache), exist_ok=True)
+    with open(f"{cache}.{os.getpid()}", "w") as index_file:
+        json.dump({"fingerprint": current, "commands": commands}, index_file)
+    os.replace(f"{cache}.{os.getpid()}", cache)
+    return commands
+
+
+def merge_commands(cli_description, commands):
+    """Return a description with commands merged into `sub_commands`."""
+    description = dict(cli_description)
+    sub_commands = dict(description.get("sub_commands", {}))
+    existing = sub_commands.get("commands", [])
+    names = {command["name"] for command in existing}
+    sub_commands["commands"] = list(existing) + [
+        command for command in commands if command["name"] not in names
+    ]
+    description["sub_commands"] = sub_commands
+    return description
@@ -0,0 +1,104 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Progress reporters injected in command handlers."""
+
+import sys
+import time
+
+
+class NullProgress:
+    """Progress reporter that does not report anything."""
+
+    def __init__(self, total=None):
+        """Initialize reporter with the expected total count."""
+        self.total = total
+        self.count = 0
+
+    def update(self, count=1):
+        """Ignore progress updates."""
+
+    def close(self):
+        """Finish reporting progress."""
+
+    def __enter__(self):
+        """Use the reporter as a context manager."""
+        return self
+
+    def __exit__(self, *_exc_info):
+        """Finish reporting progress."""
+        self.close()
+
+
+class Progress(NullProgress):
+    """Progress reporter that redraws a status line at most every interval."""
+
+    def __init__(self, stream, total=None, interval=0.1, description=None):
+        """Initialize reporter writing to `stream`."""
+        super().__init__(total)
+        self.stream = stream
+        self.interval = interval
+        self.description = description
+        self.__start = time.monotonic()
+        self.__next = self.__start + interval
+        self.__drawn = False
+
+    def update(self, count=1):
+        """Add `count` to the progress, redrawing it if the interval passed."""
+        self.count += count
+        now = time.monotonic()
+        if now >= self.__next:
+            self.__next = now + self.interval
+            self.__draw(now)
+
+    def __draw(self, now):
+        elapsed = now - self.__start
+        rate = self.count / elapsed if elapsed > 0 else 0.0
+        text = f"{self.count}"
+        if self.total:
+            text += f"/{self.total} ({100 * self.count / self.total:.0f}%)"
+        if self.description:
+            text = f"{self.description}: {text}"
+        self.stream.write(f"\r{text} [{rate:.1f}/s]\033[K")
+        self.stream.flush()
+        self.__drawn = True
+
+    def close(self):
+        """Draw the final progress, if any progress was drawn."""
+        if self.__drawn:
+            self.__draw(time.monotonic())
+            self.stream.write("\n")
+            self.stream.flush()
+
+
+def create_progress(progress_cfg, stream=None):
+    """
+    Create a progress reporter from a command `progress` configuration.
+
+    Progress is only drawn if `stream` (default: `stderr`) is a terminal,
+    otherwise a reporter that ignores updates is returned.
+    """
+    stream = sys.stderr if stream is None else stream
+    isatty = getattr(stream, "isatty", None)
+    if isatty is None or not isatty():
+        return NullProgress(progress_cfg.get("total"))
+    return Progress(
+        stream,
+        total=progress_cfg.get("total"),
+        interval=progress_cfg.get("interval", 0.1),
+        description=progress_cfg.get("description"),
+    )
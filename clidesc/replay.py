@@ -0,0 +1,165 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Replay the command executions recorded in a trace file.
+
+Usage: python -m clidesc.replay [--stub] [--repeat N] DESCRIPTION TRACE
+"""
+
+import os
+import sys
+import argparse
+import contextlib
+
+from .clidesc import CLIDesc
+from .metrics import PHASES, exit_code_for
+from .trace import read_trace
+
+
+class Collector:
+    """Collect the phase durations of replayed command executions."""
+
+    def __init__(self):
+        """Initialize collector with no durations."""
+        self.durations = {}
+
+    @staticmethod
+    def sampled():
+        """Measure every command execution."""
+        return True
+
+    def record(self, timer, _exception=None):
+        """Collect the phase durations of a command execution."""
+        key = timer.command or ""
+        for phase, duration in timer.durations().items():
+            self.durations.setdefault((key, phase), []).append(duration)
+
+
+def _stub_handler(**_kwargs):
+    """Replace a command handler, doing nothing."""
+
+
+def _stub_loader(_handler_name):
+    """Load the stub handler, in place of any command handler."""
+    return _stub_handler
+
+
+def replay(cli, records, stub=False, repeat=1):
+    """
+    Execute the command lines of trace records, measuring their phases.
+
+    Output files are not written, and the output is discarded. If `stub` is
+    true, handlers are replaced by a function that does nothing, to measure
+    only the cost of parsing and dispatching commands, and result caches are
+    not used. Pipeline
+    stages that received the result of a previous command are not replayed.
+    Raise RuntimeError if a command fails that did not fail when traced.
+    Return a dictionary with lists of durations, indexed by (command, phase).
+    """
+    collector = Collector()
+    cli.metrics = None
+    cli.tracer = collector
+    cli.use_output_files = False
+    if stub:
+        cli.handler_loader = _stub_loader
+        cli.use_cache = False
+    with open(os.devnull, "w") as devnull:
+        cli.output_stream = devnull
+        with contextlib.redirect_stdout(devnull):
+            for _ in range(repeat):
+                for record in _replayable(records):
+                    _run(cli, record)
+    return collector.durations
+
+
+def _replayable(records):
+    """Filter the records that can be executed without piped input."""
+    return [record for record in records if not record.get("piped")]
+
+
+def _run(cli, record):
+    """Execute a command line, ignoring errors only if they were traced."""
+    try:
+        cli.run(record["argv"])
+    except (SystemExit, Exception) as exc:  # pylint: disable=broad-except
+        if exit_code_for(exc) == 0 or record.get("exit_code"):
+            return
+        raise RuntimeError(
+            f"Command `{' '.join(record['argv'])}` failed, but not when"
+            f" traced: {exc!r}"
+        ) from exc
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def compare(records, durations):
+    """Compare recorded and replayed mean durations, per command and phase."""
+    recorded = {}
+    for record in _replayable(records):
+        for phase, duration in record["phases"].items():
+            key = (record["command"] or "", phase)
+            recorded.setdefault(key, []).append(duration)
+    rows = []
+    commands = sorted({command for command, _ in recorded})
+    for command in commands:
+        for phase in PHASES:
+            before = _mean(recorded.get((command, phase), []))
+            after = _mean(durations.get((command, phase), []))
+            change = (after - before) / before * 100 if before else 0.0
+            rows.append((command or "-", phase, before, after, change))
+    return rows
+
+
+def main(argv=None):
+    """Replay a trace file, reporting latency differences per command."""
+    parser = argparse.ArgumentParser(
+        prog="python -m clidesc.replay",
+        description="Replay the commands recorded in a trace file.",
+    )
+    parser.add_argument("description", help="CLI description file")
+    parser.add_argument("trace", help="trace file")
+    parser.add_argument(
+        "--stub", action="store_true", help="replace handlers by stubs"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="number of replays"
+    )
+    args = parser.parse_args(argv)
+    records = read_trace(args.trace)
+    cli = CLIDesc.from_file(args.description)
+    try:
+        durations = replay(cli, records, args.stub, args.repeat)
+    except RuntimeError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    print(
+        f"{'command':20} {'phase':8} {'recorded':>10} {'replayed':>10} "
+        f"{'change':>8}"
+    )
+    for command, phase, before, after, change in compare(records, durations):
+        print(
+            f"{command:20} {phase:8} {before * 1000:8.3f}ms "
+            f"{after * 1000:8.3f}ms {change:+7.1f}%"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
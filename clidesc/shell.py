@@ -0,0 +1,146 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Interactive shell that executes commands with a warm CLIDesc."""
+
+import os
+import sys
+import cmd
+import shlex
+
+try:
+    import readline
+except ImportError:  # pragma: no cover
+    readline = None
+
+from .cache import default_cache_dir
+
+
+class Shell(cmd.Cmd):
+    """Read command lines and dispatch them to a CLIDesc instance."""
+
+    def __init__(self, cli, cli_description, stdin=None, stdout=None):
+        """Initialize the shell for a CLI application and its description."""
+        super().__init__(stdin=stdin, stdout=stdout)
+        shell_cfg = cli_description.get("shell", {})
+        if not isinstance(shell_cfg, dict):
+            shell_cfg = {}
+        program = cli_description["program"]
+        self.cli = cli
+        self.description = cli_description
+        self.prompt = shell_cfg.get("prompt", f"{program}> ")
+        self.history = shell_cfg.get(
+            "history", default_cache_dir(program, "history")
+        )
+        if stdin is not None:
+            self.use_rawinput = False
+
+    def preloop(self):
+        """Load the command history."""
+        if readline is not None and self.use_rawinput:
+            try:
+                readline.read_history_file(os.path.expanduser(self.history))
+            except OSError:
+                pass
+
+    def postloop(self):
+        """Save the command history."""
+        if readline is not None and self.use_rawinput:
+            history = os.path.expanduser(self.history)
+            os.makedirs(os.path.dirname(history), exist_ok=True)
+            readline.write_history_file(history)
+
+    def emptyline(self):
+        """Do nothing for empty lines."""
+
+    def default(self, line):
+        """Execute a command line."""
+        argv = self.__split(line)
+        if argv is not None:
+            self.execute(argv)
+
+    def do_help(self, arg):
+        """Display the help for a command."""
+        argv = self.__split(arg)
+        if argv is not None:
+            self.execute(argv + ["--help"])
+
+    def do_exit(self, _arg):
+        """Exit the shell."""
+        return True
+
+    def do_EOF(self, _arg):  # pylint: disable=invalid-name
+        """Exit the shell at end of input."""
+        print(file=self.stdout)
+        return True
+
+    def __split(self, line):
+        """Split a command line into words, reporting syntax errors."""
+        try:
+            return shlex.split(line)
+        except ValueError as exc:
+            self.__error(exc)
+            return None
+
+    def __error(self, message):
+        print(f"ERROR: {message}", file=sys.stderr)
+        self.cli.exit_code = 1
+
+    def execute(self, argv):
+        """Execute a command, reporting errors instead of exiting."""
+        if "--shell" in argv:
+            self.__error("--shell cannot be used in the shell")
+            return
+        try:
+            self.cli.run(argv)
+        except SystemExit as sysexit:
+            self.cli.exit_code = sysexit.code
+        except Exception as exc:  # pylint: disable=broad-except
+            self.__error(exc)
+        else:
+            self.cli.exit_code = 0
+
+    def __candidates(self, words):
+        """List the commands and options available after `words`."""
+        cmd_description = self.description
+        for word in words:
+            commands = cmd_description.get("sub_commands", {}).get("commands")
+            for command in commands or []:
+                if word in [command["name"], *command.get("aliases", [])]:
+                    cmd_description = command
+                    break
+        commands = cmd_description.get("sub_commands", {}).get("commands")
+        candidates = []
+        for command in commands or []:
+            candidates.extend([command["name"], *command.get("aliases", [])])
+        for argument in cmd_description.get("arguments", []):
+            if argument.get("optional"):
+                candidates.append(f"--{argument['name']}")
+        return candidates + ["--help"]
+
+    def completenames(self, text, *ignored):
+        """Complete the first word of a command line."""
+        return [c for c in self.__candidates([]) if c.startswith(text)]
+
+    def completedefault(self, *args):
+        """Complete words following the first word of a command line."""
+        text, line, begidx, _ = args
+        try:
+            words = shlex.split(line[:begidx])
+        except ValueError:
+            return []
+        return [c for c in self.__candidates(words) if c.startswith(text)]
@@ -0,0 +1,57 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Recording of command executions to trace files."""
+
+import os
+import json
+import time
+
+from .metrics import error_name, exit_code_for
+
+
+class Tracer:
+    """Append a record of each command execution to a trace file."""
+
+    def __init__(self, filename):
+        """Initialize tracer writing to `filename`."""
+        self.filename = os.path.expanduser(filename)
+
+    @staticmethod
+    def sampled():
+        """Trace every command execution."""
+        return True
+
+    def record(self, timer, exception=None):
+        """Record the command line, command and phase durations."""
+        record = {
+            "time": time.time(),
+            "argv": timer.argv,
+            "piped": timer.piped,
+            "command": timer.command,
+            "phases": timer.durations(),
+            "exception": error_name(timer, exception),
+            "exit_code": exit_code_for(exception),
+        }
+        with open(self.filename, "a") as trace_file:
+            trace_file.write(json.dumps(record) + "\n")
+
+
+def read_trace(filename):
+    """Read the records of a trace file."""
+    with open(os.path.expanduser(filename), "r") as trace_file:
+        return [json.loads(line) for line in trace_file if line.strip()]
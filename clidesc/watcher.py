@@ -0,0 +1,60 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Watch a CLI description file for changes."""
+
+import os
+import threading
+
+
+class FileWatcher(threading.Thread):
+    """Poll the modification time of a file, in a background thread."""
+
+    def __init__(self, filename, interval=1.0):
+        """Initialize watcher for a file, polling every `interval` seconds."""
+        super().__init__(name=f"clidesc-watcher:{filename}", daemon=True)
+        self.filename = filename
+        self.interval = interval
+        self.__stopped = threading.Event()
+        self.__changed = threading.Event()
+        self.__last = self.__stat()
+
+    def __stat(self):
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def run(self):
+        """Poll the file until the watcher is stopped."""
+        while not self.__stopped.wait(self.interval):
+            current = self.__stat()
+            if current is not None and current != self.__last:
+                self.__last = current
+                self.__changed.set()
+
+    def changed(self):
+        """Check if the file changed since the last call."""
+        if self.__changed.is_set():
+            self.__changed.clear()
+            return True
+        return False
+
+    def stop(self):
+        """Stop watching the file."""
+        self.__stopped.set()
@@ -0,0 +1,111 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Asynchronous output, written by a background thread."""
+
+import queue
+import threading
+
+
+class AsyncWriter:
+    """
+    Text stream that writes to another stream in a background thread.
+
+    Writes are queued in a bounded queue, so writers block (backpressure)
+    when `queue_size` writes are pending. Pending writes are batched into a
+    single write to the underlying stream. Errors raised by the underlying
+    stream are raised by the next call to `write`, `flush` or `close`.
+    """
+
+    def __init__(self, stream, queue_size=1024):
+        """Initialize writer, starting the background thread."""
+        self.stream = stream
+        self.closed = False
+        self.__queue = queue.Queue(maxsize=queue_size)
+        self.__error = None
+        self.__thread = threading.Thread(target=self.__drain, daemon=True)
+        self.__thread.start()
+
+    def __getattr__(self, name):
+        """Delegate other attributes to the underlying stream."""
+        return getattr(self.stream, name)
+
+    def __drain(self):
+        running = True
+        while running:
+            items = [self.__queue.get()]
+            while True:
+                try:
+                    items.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+            chunks = []
+            for item in items:
+                if isinstance(item, str):
+                    chunks.append(item)
+                    continue
+                self.__write("".join(chunks))
+                chunks = []
+                if item is None:
+                    running = False
+                else:
+                    self.__write(None)
+                    item.set()
+            self.__write("".join(chunks))
+
+    def __write(self, text):
+        """Write text to the stream, or flush it if `text` is None."""
+        if self.__error is not None or text == "":
+            return
+        try:
+            if text is None:
+                self.stream.flush()
+            else:
+                self.stream.write(text)
+        except Exception as exc:  # pylint: disable=broad-except
+            self.__error = exc
+
+    def __check(self):
+        if self.__error is not None:
+            error, self.__error = self.__error, None
+            raise error
+
+    def write(self, text):
+        """Queue text to be written, blocking if the queue is full."""
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        self.__check()
+        self.__queue.put(text)
+        return len(text)
+
+    def flush(self):
+        """Wait until all queued text is written, and flush the stream."""
+        if self.closed:
+            return
+        done = threading.Event()
+        self.__queue.put(done)
+        done.wait()
+        self.__check()
+
+    def close(self):
+        """Write all queued text, and stop the background thread."""
+        if not self.closed:
+            self.closed = True
+            self.__queue.put(threading.Event())
+            self.__queue.put(None)
+            self.__thread.join()
+        self.__check()
@@ -0,0 +1,48 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+@stdout @stderr
+Feature: Write output asynchronously.
+
+Scenario: Output written by a background thread.
+    Given the CLI description
+        """
+        ---
+        program: greeting
+        description: A greeting application.
+        version: 1.0
+        handler: greeting.hello
+        async_output:
+          queue_size: 2
+        output:
+          string:
+            no_key: yes
+          list:
+            no_key: yes
+        """
+        And a function "greeting.hello", returning:
+        | field  | type   | value         |
+        | string | string | Some value.   |
+        | list   | list   | Jim, Joe, Sam |
+    When the application is executed without parameters
+    Then the output is
+        """
+        Some value.
+        - Jim
+        - Joe
+        - Sam
+        """
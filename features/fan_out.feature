@@ -0,0 +1,71 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+@stdout @stderr
+Feature: Fan out a command over many argument values.
+
+Scenario: Call the handler once for each value.
+    Given the CLI description
+        """
+        ---
+        program: fanout
+        description: A fan out application.
+        version: 1.0
+        handler: fan.lookup
+        output: "{host} found"
+        arguments:
+        - name: host
+          description: Hosts to lookup.
+          nargs: '*'
+          fan_out:
+            workers: 2
+        """
+        And a function "fan.lookup"
+    When the application is executed with [a, b, c, d]
+    Then the output is
+        """
+        a found
+        b found
+        c found
+        d found
+        """
+
+Scenario: Report errors for each value.
+    Given the CLI description
+        """
+        ---
+        program: fanout
+        description: A fan out application.
+        version: 1.0
+        handler: fan.fail
+        output: yes
+        arguments:
+        - name: host
+          description: Hosts to lookup.
+          nargs: '*'
+          fan_out:
+            on_error: continue
+        """
+        And a function named "fan.fail" raises ValueError, with message "not found"
+    When the application is executed with [a, b]
+    Then the error output is
+        """
+        ERROR: a: not found
+        ERROR: b: not found
+        """
+        And the output is empty
+        And the exit code is 1
@@ -226,3 +226,65 @@ Scenario: Multiple command levels.
         """
         another_arg: value
         """
+
+Scenario: Nested commands with the same name.
+    Given the CLI description
+        """
+        ---
+        program: multi
+        description: A multi-command application.
+        sub_commands:
+          commands:
+            - name: remote
+              description: Manage remotes.
+              sub_commands:
+                commands:
+                - name: list
+                  description: List remotes.
+                  handler: multi.list_items
+                  output: "remote {name}"
+                  arguments:
+                  - name: name
+                    description: Remote name.
+            - name: branch
+              description: Manage branches.
+              sub_commands:
+                commands:
+                - name: list
+                  description: List branches.
+                  handler: multi.list_items
+                  output: "branch {name}"
+                  arguments:
+                  - name: name
+                    description: Branch name.
+        """
+        And a function "multi.list_items"
+    When the application is executed with [remote, list, origin]
+    Then the output is
+        """
+        remote origin
+        """
+
+Scenario: Command aliases.
+    Given the CLI description
+        """
+        ---
+        program: multi
+        description: A multi-command application.
+        sub_commands:
+          commands:
+            - name: remove
+              aliases: [rm, del]
+              description: Remove an item.
+              handler: multi.remove
+              output: "removed {item}"
+              arguments:
+              - name: item
+                description: Item to remove.
+        """
+        And a function "multi.remove"
+    When the application is executed with [rm, something]
+    Then the output is
+        """
+        removed something
+        """
@@ -0,0 +1,76 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+@stdout @stderr
+Feature: Pipe handler results between commands.
+
+Scenario: Pipe the result of a command to the next command.
+    Given the CLI description
+        """
+        ---
+        program: pipes
+        description: A pipeline application.
+        version: 1.0
+        sub_commands:
+          commands:
+          - name: produce
+            description: Produce some data.
+            handler: first.produce
+            arguments:
+            - name: x
+              description: Some value.
+              optional: yes
+          - name: consume
+            description: Consume some data.
+            handler: second.consume
+            output: "{data[x]} and {y}"
+            arguments:
+            - name: data
+              description: Piped data.
+              pipe: yes
+            - name: y
+              description: Another value.
+              optional: yes
+        """
+        And a function "first.produce"
+        And a function "second.consume"
+    When the application is executed with [produce, --x, 1, :::, consume, --y, 2]
+    Then the output is
+        """
+        1 and 2
+        """
+
+Scenario: Pipe to a command that does not accept piped data.
+    Given the CLI description
+        """
+        ---
+        program: pipes
+        description: A pipeline application.
+        version: 1.0
+        sub_commands:
+          commands:
+          - name: produce
+            description: Produce some data.
+            handler: first.produce
+          - name: other
+            description: Do not accept piped data.
+            handler: second.other
+        """
+        And a function "first.produce"
+        And a function "second.other"
+    When the application is executed with [produce, :::, other]
+    Then exception ValueError is raised
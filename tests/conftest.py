@@ -17,7 +17,103 @@
 
 """Common objects for pytest."""
 
+import os
+import time
+
 
 def simple_handler(**kwargs):
     """Simple CLI handler that returns the arguments."""
     return kwargs
+
+
+CALLS = []
+
+
+def counting_handler(**kwargs):
+    """CLI handler that records each call and returns the arguments."""
+    CALLS.append(kwargs)
+    return kwargs
+
+
+OPENED = []
+
+
+def reading_handler(data):
+    """CLI handler that reads its `data` argument."""
+    OPENED.append(data)
+    if hasattr(data, "read"):
+        return data.read()
+    if hasattr(data, "__getitem__"):
+        return bytes(data[:])
+    return list(data)
+
+
+def failing_handler(**_kwargs):
+    """CLI handler that always raises ValueError."""
+    raise ValueError("always fails")
+
+
+def nested_handler(depth):
+    """CLI handler that returns dictionaries nested `depth` levels."""
+    data = {"value": depth}
+    for level in range(int(depth)):
+        data = {f"level{level}": data}
+    return data
+
+
+def cyclic_handler():
+    """CLI handler that returns a dictionary that contains itself."""
+    data = {"name": "root"}
+    data["self"] = data
+    return data
+
+
+def bytes_handler(value):
+    """CLI handler that returns `value` encoded as UTF-8 bytes."""
+    return value.encode("utf-8")
+
+
+def path_handler(value):
+    """CLI handler that returns the path `value`."""
+    return value
+
+
+def open_handler(value):
+    """CLI handler that returns the file `value`, opened for reading."""
+    return open(value, "rb")  # pylint: disable=consider-using-with
+
+
+def progress_handler(count, progress):
+    """CLI handler that reports progress of `count` steps."""
+    progress.total = int(count)
+    for _ in range(int(count)):
+        progress.update()
+    return type(progress).__name__
+
+
+def sleeping_handler(value):
+    """CLI handler that sleeps `value` seconds, returning the process id."""
+    time.sleep(float(value))
+    return os.getpid()
+
+
+def allocating_handler(value):
+    """CLI handler that allocates `value` bytes."""
+    return len(bytearray(int(value)))
+
+
+def crashing_handler(value):
+    """CLI handler that ends its process, if `value` is not zero."""
+    if int(value):
+        os._exit(int(value))
+    return os.getpid()
+
+
+def random_handler(value):
+    """CLI handler that returns `value` and a random token."""
+    return value, os.urandom(8).hex()
+
+
+def simple_loader(_handler_name):
+    """Load `simple_handler`, in place of any handler."""
+    return simple_handler
@@ -0,0 +1,87 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test arguments delivered as arrays of numbers."""
+
+import io
+import sys
+import array
+
+import pytest
+import yaml
+
+from clidesc import CLIDesc
+
+
+def __array_cli(datatype="int", container="array"):
+    description = f"""
+---
+program: test_array_arguments
+description: Test array arguments.
+handler: conftest.simple_handler
+arguments:
+- name: values
+  description: list of values.
+  type: {datatype}
+  nargs: '*'
+  container: {container}
+  response_files: yes
+"""
+    return CLIDesc(yaml.safe_load(description))
+
+
+def test_int_array():
+    """Test if int values are delivered as an array."""
+    values = __array_cli().run(["1", "2", "3"])["values"]
+    assert values == array.array("q", [1, 2, 3])
+
+
+def test_float_array_from_response_file_and_stdin(tmp_path, monkeypatch):
+    """Test if values from response files and stdin are in the array."""
+    path = tmp_path / "values.txt"
+    path.write_text("1.5\n\n2.5\n")
+    monkeypatch.setattr(sys, "stdin", io.StringIO("3.5\n"))
+    values = __array_cli("float").run([f"@{path}", "-", "4"])["values"]
+    assert values == array.array("d", [1.5, 2.5, 3.5, 4.0])
+
+
+def test_invalid_array_value(capsys):
+    """Test if invalid values are usage errors."""
+    with pytest.raises(SystemExit):
+        __array_cli().run(["1", "x"])
+    assert "invalid int value: 'x'" in capsys.readouterr().err
+
+
+def test_array_value_out_of_range(capsys):
+    """Test if values that do not fit the array are usage errors."""
+    with pytest.raises(SystemExit):
+        __array_cli().run([str(2**64)])
+    assert "int value out of range" in capsys.readouterr().err
+
+
+def test_invalid_array_type():
+    """Test if only numeric arguments can use array containers."""
+    with pytest.raises(ValueError):
+        __array_cli("str").run([])
+
+
+def test_numpy_array():
+    """Test if values are delivered as a NumPy array."""
+    numpy = pytest.importorskip("numpy")
+    values = __array_cli("float", "numpy").run(["1", "2.5"])["values"]
+    assert isinstance(values, numpy.ndarray)
+    assert values.tolist() == [1.0, 2.5]
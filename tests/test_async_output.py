@@ -0,0 +1,111 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test the asynchronous output writer."""
+
+import io
+import threading
+
+import pytest
+
+from clidesc import CLIDesc
+from clidesc.writer import AsyncWriter
+
+
+class BlockingStream(io.StringIO):
+    """Text stream that blocks writes until it is released."""
+
+    def __init__(self):
+        """Initialize a blocked stream."""
+        super().__init__()
+        self.released = threading.Event()
+
+    def write(self, text):
+        """Write text, once the stream is released."""
+        self.released.wait()
+        return super().write(text)
+
+
+class BrokenStream(io.StringIO):
+    """Text stream that fails on every write."""
+
+    def write(self, text):
+        """Fail to write text."""
+        raise BrokenPipeError("broken pipe")
+
+
+def test_writes_in_order_and_flushes_on_close():
+    """Test if all writes reach the stream, in order, when closed."""
+    stream = io.StringIO()
+    writer = AsyncWriter(stream, queue_size=4)
+    for index in range(100):
+        print(index, file=writer)
+    writer.close()
+    assert stream.getvalue() == "".join(f"{i}\n" for i in range(100))
+
+
+def test_backpressure_blocks_writers():
+    """Test if writers block while the queue is full."""
+    stream = BlockingStream()
+    writer = AsyncWriter(stream, queue_size=1)
+    writes = []
+
+    def produce():
+        for index in range(5):
+            writer.write(f"{index}")
+            writes.append(index)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    producer.join(timeout=0.1)
+    assert producer.is_alive()
+    assert len(writes) < 5
+    stream.released.set()
+    producer.join()
+    writer.flush()
+    assert stream.getvalue() == "01234"
+    writer.close()
+
+
+def test_stream_errors_are_raised():
+    """Test if errors of the underlying stream are raised to writers."""
+    writer = AsyncWriter(BrokenStream())
+    writer.write("text")
+    with pytest.raises(BrokenPipeError):
+        writer.flush()
+    writer.close()
+    with pytest.raises(ValueError):
+        writer.write("text")
+
+
+def test_output_stream_is_restored():
+    """Test if the CLI output stream is flushed and restored after run."""
+    cli = CLIDesc(
+        {
+            "program": "test_async",
+            "description": "Test async output.",
+            "handler": "conftest.simple_handler",
+            "output": "{value}",
+            "async_output": {"queue_size": 1},
+            "arguments": [{"name": "value", "description": "value"}],
+        }
+    )
+    stream = io.StringIO()
+    cli.output_stream = stream
+    cli.run(["some text"])
+    assert cli.output_stream is stream
+    assert stream.getvalue() == "some text\n"
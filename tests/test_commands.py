@@ -0,0 +1,105 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test the command trie and command dispatch."""
+
+import copy
+
+from clidesc import CLIDesc
+from clidesc.commands import build_command_trie
+
+# pylint: disable=protected-access
+
+
+def create_description(count):
+    """Create a description with `count` groups of two nested commands."""
+    return {
+        "program": "test_commands",
+        "description": "Test commands.",
+        "sub_commands": {
+            "commands": [
+                {
+                    "name": f"group{index}",
+                    "description": f"Group {index}.",
+                    "sub_commands": {
+                        "commands": [
+                            {
+                                "name": "list",
+                                "aliases": ["ls"],
+                                "description": "List.",
+                                "handler": "conftest.simple_handler",
+                                "arguments": [
+                                    {"name": "item", "description": "item"}
+                                ],
+                            },
+                            {
+                                "name": "show",
+                                "description": "Show.",
+                                "handler": "conftest.counting_handler",
+                            },
+                        ]
+                    },
+                }
+                for index in range(count)
+            ]
+        },
+    }
+
+
+def test_command_trie_lookup():
+    """Test if commands are found by path of names and aliases."""
+    root = build_command_trie(create_description(3))
+    command = root.find(("group1", "list"))
+    assert command.path == ("group1", "list")
+    assert command.handler == "conftest.simple_handler"
+    assert root.find(("group1", "ls")) is command
+    assert root.find(("group2", "list")) is not command
+    assert root.find(("group1", "missing")) is None
+    assert root.find(()) is root
+
+
+def test_dispatch_many_nested_commands():
+    """Test if thousands of nested commands with equal names dispatch."""
+    cli = CLIDesc(create_description(2000))
+    assert cli.run(["group1999", "list", "x"]) == {"item": "x"}
+    assert cli.run(["group7", "ls", "y"]) == {"item": "y"}
+    assert cli.run(["group7", "show"]) == {}
+
+
+def test_aliases_share_parser():
+    """Test if an alias uses the same parser as the command name."""
+    cli = CLIDesc(create_description(1))
+    cli.run(["group0", "list", "x"])
+    group = cli._CLIDesc__commands.find(("group0",))
+    parsers = group.subparser._name_parser_map
+    assert parsers["ls"] is parsers["list"]
+    assert parsers["list"] is group.children["list"].parser
+
+
+def test_reload_changed_aliases():
+    """Test if reloading a command replaces its aliases."""
+    description = create_description(1)
+    cli = CLIDesc(description)
+    cli.run(["group0", "ls", "x"])
+    changed = copy.deepcopy(description)
+    command = changed["sub_commands"]["commands"][0]["sub_commands"]
+    command["commands"][0]["aliases"] = ["l"]
+    cli.reload(changed)
+    assert cli.run(["group0", "l", "x"]) == {"item": "x"}
+    group = cli._CLIDesc__commands.find(("group0",))
+    assert "ls" not in group.children
+    assert "ls" not in group.subparser._name_parser_map
@@ -0,0 +1,61 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test displaying deeply nested and cyclic results."""
+
+import io
+import sys
+
+from clidesc import CLIDesc
+
+
+def create_cli(handler, output=None, **command):
+    """Create a CLI with a single command using `handler`."""
+    command.update({"name": "show", "description": "Show.", "handler": handler})
+    if output is not None:
+        command["output"] = output
+    cli = CLIDesc(
+        {
+            "program": "test_display",
+            "description": "Test display.",
+            "sub_commands": {"commands": [command]},
+        }
+    )
+    cli.output_stream = io.StringIO()
+    return cli
+
+
+def test_display_deeply_nested_result():
+    """Test if nesting deeper than the recursion limit is displayed."""
+    depth = sys.getrecursionlimit() * 2
+    cli = create_cli(
+        "conftest.nested_handler",
+        {"padding": 0},
+        arguments=[{"name": "depth", "description": "depth"}],
+    )
+    cli.run(["show", str(depth)])
+    lines = cli.output_stream.getvalue().splitlines()
+    assert len(lines) == depth + 1
+    assert lines[0] == f"level{depth - 1}:"
+    assert lines[-1] == f"value: {depth}"
+
+
+def test_display_cyclic_result():
+    """Test if a dictionary that contains itself is displayed once."""
+    cli = create_cli("conftest.cyclic_handler", True)
+    cli.run(["show"])
+    assert cli.output_stream.getvalue() == "name: root\nself:\n    {...}\n"
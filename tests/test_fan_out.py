@@ -0,0 +1,168 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test fan out of handlers over multiple values."""
+
+import pytest
+import yaml
+
+from clidesc import CLIDesc
+
+
+def __fan_out_cli(fan_out):
+    description = f"""
+---
+program: test_fan_out
+description: Test fan out.
+handler: conftest.simple_handler
+arguments:
+- name: value
+  description: values.
+  type: int
+  nargs: '*'
+  fan_out: {fan_out}
+- name: scale
+  description: some other argument.
+  type: int
+  optional: yes
+  default: 1
+"""
+    return CLIDesc(yaml.safe_load(description))
+
+
+def test_single_value_is_not_fanned_out():
+    """Test if a single value is given to the handler as is."""
+    result = __fan_out_cli("yes").run(["1"])
+    assert result == {"value": 1, "scale": 1}
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_fan_out_executors(executor):
+    """Test if all values are processed, keeping other arguments."""
+    cli = __fan_out_cli(f"{{executor: {executor}, ordered: no}}")
+    result = cli.run([str(i) for i in range(10)] + ["--scale", "2"])
+    assert sorted(r["value"] for r in result) == list(range(10))
+    assert all(r["scale"] == 2 for r in result)
+
+
+def test_fan_out_failure_is_raised():
+    """Test if an error in a value is raised by default."""
+    description = yaml.safe_load("""
+---
+program: test_fan_out
+description: Test fan out.
+handler: conftest.failing_handler
+arguments:
+- name: value
+  description: values.
+  nargs: '*'
+  fan_out: yes
+""")
+    with pytest.raises(ValueError):
+        CLIDesc(description).run(["1", "2"])
+
+
+def test_process_fan_out_opens_files(tmp_path):
+    """Test if file arguments are opened in the worker processes."""
+    paths = []
+    for i in range(3):
+        paths.append(tmp_path / f"data{i}.txt")
+        paths[-1].write_text(f"data {i}")
+    description = yaml.safe_load("""
+---
+program: test_fan_out
+description: Test fan out.
+handler: conftest.reading_handler
+arguments:
+- name: data
+  description: data files.
+  type: file
+  nargs: '*'
+  fan_out: {executor: process}
+""")
+    result = CLIDesc(description).run([str(path) for path in paths])
+    assert result == ["data 0", "data 1", "data 2"]
+
+
+def test_process_fan_out_timeout():
+    """Test if process fan out applies the command timeout."""
+    description = yaml.safe_load("""
+---
+program: test_fan_out
+description: Test fan out.
+handler: conftest.sleeping_handler
+timeout: 0.5
+arguments:
+- name: value
+  description: values.
+  nargs: '*'
+  fan_out: {executor: process, workers: 2}
+""")
+    with pytest.raises(TimeoutError):
+        CLIDesc(description).run(["0", "60"])
+
+
+def test_process_fan_out_timeout_keeps_other_values(capsys):
+    """Test if a timeout does not kill the workers of other values."""
+    description = yaml.safe_load("""
+---
+program: test_fan_out
+description: Test fan out.
+handler: conftest.sleeping_handler
+output: yes
+timeout: 2
+arguments:
+- name: value
+  description: values.
+  nargs: '*'
+  fan_out: {executor: process, workers: 2, on_error: continue}
+""")
+    with pytest.raises(SystemExit) as sysexit:
+        CLIDesc(description).run(["10", "0.5", "1.8"])
+    assert sysexit.value.code == 1
+    output = capsys.readouterr()
+    assert len(output.out.splitlines()) == 2
+    errors = output.err
+    assert "ERROR: 10: Handler" in errors
+    assert "timed out" in errors
+    assert "died" not in errors
+
+
+def test_invalid_fan_out_executor():
+    """Test if invalid fan out executors are rejected."""
+    with pytest.raises(ValueError):
+        __fan_out_cli("{executor: fiber}")
+
+
+def test_process_fan_out_uses_cache():
+    """Test if results of worker processes are cached."""
+    description = yaml.safe_load("""
+---
+program: test_fan_out
+description: Test fan out.
+handler: conftest.random_handler
+cache: yes
+arguments:
+- name: value
+  description: values.
+  nargs: '*'
+  fan_out: {executor: process}
+""")
+    cli = CLIDesc(description)
+    result = cli.run(["1", "2"])
+    assert cli.run(["1", "2"]) == result
+    assert cli.run(["1", "2", "--refresh-cache"]) != result
@@ -0,0 +1,80 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test file, stream, lines and mmap argument types."""
+
+import io
+import sys
+
+import pytest
+import yaml
+
+import conftest
+from clidesc import CLIDesc
+
+
+def __file_cli(arg_type, mode="r"):
+    description = f"""
+---
+program: test_files
+description: Test file arguments.
+handler: conftest.reading_handler
+arguments:
+- name: data
+  description: data file.
+  type: {arg_type}
+  mode: {mode}
+  required: yes
+"""
+    return CLIDesc(yaml.safe_load(description))
+
+
+@pytest.fixture(name="data_file")
+def _data_file(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_text("first\nsecond\n")
+    return str(path)
+
+
+def test_file_is_opened_and_closed(data_file):
+    """Test if file arguments are opened for, and closed after, the handler."""
+    result = __file_cli("file").run([data_file])
+    assert result == "first\nsecond\n"
+    assert conftest.OPENED[-1].closed
+
+
+def test_lines_is_lazy_line_iterator(data_file):
+    """Test if `lines` arguments provide lines without newlines."""
+    assert __file_cli("lines").run([data_file]) == ["first", "second"]
+
+
+def test_mmap_is_read_only_buffer(data_file):
+    """Test if `mmap` arguments provide a memory mapped buffer."""
+    assert __file_cli("mmap").run([data_file]) == b"first\nsecond\n"
+    assert conftest.OPENED[-1].closed
+
+
+def test_stream_reads_stdin(monkeypatch):
+    """Test if `stream` arguments use stdin for `-`."""
+    monkeypatch.setattr(sys, "stdin", io.StringIO("from stdin"))
+    assert __file_cli("stream").run(["-"]) == "from stdin"
+
+
+def test_missing_file_is_usage_error(tmp_path):
+    """Test if a missing input file is reported as an usage error."""
+    with pytest.raises(SystemExit):
+        __file_cli("file").run([str(tmp_path / "missing.txt")])
@@ -0,0 +1,81 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test the cache of formatted help output."""
+
+import argparse
+
+import pytest
+import yaml
+
+import clidesc
+from clidesc import CLIDesc
+
+DESCRIPTION = """
+---
+program: test_help
+description: Test help cache.
+help_cache: {path}
+sub_commands:
+  commands:
+  - name: greet
+    description: Greet someone.
+    handler: conftest.simple_handler
+    arguments:
+    - name: someone
+      description: someone to greet.
+"""
+
+
+def __help_output(capsys, cli, argv):
+    with pytest.raises(SystemExit) as sysexit:
+        cli.run(argv)
+    assert sysexit.value.code == 0
+    return capsys.readouterr().out
+
+
+def test_cached_help_does_not_build_parsers(capsys, monkeypatch, tmp_path):
+    """Test if cached help is displayed without creating parsers."""
+    description = yaml.safe_load(DESCRIPTION.format(path=tmp_path))
+    expected = __help_output(capsys, CLIDesc(description), ["greet", "-h"])
+    assert "someone to greet." in expected
+
+    def no_parser(*_args, **_kwargs):
+        raise AssertionError("Parser should not be created.")
+
+    monkeypatch.setattr(argparse, "ArgumentParser", no_parser)
+    cli = CLIDesc(description)
+    assert __help_output(capsys, cli, ["greet", "--help"]) == expected
+
+
+def test_help_cache_keyed_by_description(capsys, tmp_path):
+    """Test if a changed description does not use stale help."""
+    description = yaml.safe_load(DESCRIPTION.format(path=tmp_path))
+    __help_output(capsys, CLIDesc(description), ["-h"])
+    description["description"] = "Changed description."
+    assert "Changed description." in __help_output(
+        capsys, CLIDesc(description), ["-h"]
+    )
+
+
+def test_help_cache_keyed_by_version(capsys, monkeypatch, tmp_path):
+    """Test if help cached by other clidesc versions is not used."""
+    description = yaml.safe_load(DESCRIPTION.format(path=tmp_path))
+    __help_output(capsys, CLIDesc(description), ["-h"])
+    monkeypatch.setattr(clidesc, "__version__", "0.0.0")
+    __help_output(capsys, CLIDesc(description), ["-h"])
+    assert len(list(tmp_path.glob("*.txt"))) == 2
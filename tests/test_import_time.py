@@ -0,0 +1,70 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test the cost of importing clidesc."""
+
+import os
+import sys
+import subprocess
+
+# Import time budget, in microseconds, for `import clidesc`.
+IMPORT_BUDGET = int(os.environ.get("CLIDESC_IMPORT_BUDGET_US", "50000"))
+
+HEAVY_MODULES = [
+    "argparse",
+    "yaml",
+    "traceback",
+    "itertools",
+    "re",
+    "json",
+    "pickle",
+    "importlib.metadata",
+]
+
+
+def __python(*args):
+    return subprocess.run(
+        [sys.executable, *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_import_does_not_load_heavy_modules():
+    """Test if importing clidesc does not import unneeded modules."""
+    code = (
+        "import sys; before = set(sys.modules); import clidesc; "
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} "
+        "if m in sys.modules and m not in before))"
+    )
+    assert __python("-c", code).stdout.strip() == ""
+
+
+def test_import_time_budget():
+    """Test if `import clidesc` is within the import time budget."""
+    stderr = __python("-X", "importtime", "-c", "import clidesc").stderr
+    cumulative = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, total, name = line.split("|")
+            if total.strip().isdigit():
+                cumulative[name.strip()] = int(total)
+    assert cumulative["clidesc"] <= IMPORT_BUDGET, (
+        f"import clidesc took {cumulative['clidesc']}us, "
+        f"budget is {IMPORT_BUDGET}us"
+    )
@@ -0,0 +1,115 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test handler execution in isolated worker processes."""
+
+import os
+import io
+import time
+
+import pytest
+
+import conftest
+from clidesc import CLIDesc
+from clidesc.execution import memory_size
+
+
+def create_cli(handler, **attributes):
+    """Create a CLI for a handler with a single argument."""
+    description = {
+        "program": "test_isolation",
+        "description": "Test isolation.",
+        "handler": handler,
+        "arguments": [{"name": "value", "description": "value"}],
+        "exceptions": [
+            {"class": "TimeoutError", "exit_code": 3},
+            {"class": "MemoryError", "exit_code": 4},
+            {"class": "ChildProcessError", "exit_code": 5},
+        ],
+    }
+    description.update(attributes)
+    cli = CLIDesc(description)
+    cli.output_stream = io.StringIO()
+    return cli
+
+
+def test_handler_runs_in_reused_worker():
+    """Test if isolated handlers run in the same worker process."""
+    cli = create_cli("conftest.sleeping_handler", isolate="process")
+    worker = cli.run(["0"])
+    assert worker != os.getpid()
+    assert cli.run(["0"]) == worker
+
+
+def test_handler_runs_in_process_by_default():
+    """Test if handlers without limits run in the CLI process."""
+    cli = create_cli("conftest.sleeping_handler")
+    assert cli.run(["0"]) == os.getpid()
+
+
+def test_timeout_kills_worker():
+    """Test if a handler is killed on timeout, and the pool restarted."""
+    cli = create_cli("conftest.sleeping_handler", timeout=0.5)
+    worker = cli.run(["0"])
+    start = time.monotonic()
+    with pytest.raises(SystemExit) as sysexit:
+        cli.run(["60"])
+    assert sysexit.value.code == 3
+    assert time.monotonic() - start < 30
+    assert "timed out after 0.5 seconds" in cli.output_stream.getvalue()
+    assert cli.run(["0"]) != worker
+
+
+def test_worker_crash():
+    """Test if a dead worker process raises an error, and is replaced."""
+    cli = create_cli("conftest.crashing_handler", isolate="process")
+    with pytest.raises(SystemExit) as sysexit:
+        cli.run(["3"])
+    assert sysexit.value.code == 5
+    assert "Worker process of handler" in cli.output_stream.getvalue()
+    assert cli.run(["0"]) != os.getpid()
+
+
+def test_handler_loader():
+    """Test if the handler loader is used in and out of worker processes."""
+    for isolate in [False, "process"]:
+        cli = create_cli("conftest.crashing_handler", isolate=isolate)
+        cli.handler_loader = conftest.simple_loader
+        assert cli.run(["3"]) == {"value": "3"}
+
+
+def test_memory_limit():
+    """Test if handlers exceeding the memory limit fail."""
+    cli = create_cli("conftest.allocating_handler", max_memory="512M")
+    assert cli.run(["1024"]) == 1024
+    with pytest.raises(SystemExit) as sysexit:
+        cli.run([str(2 * 1024**3)])
+    assert sysexit.value.code == 4
+
+
+def test_memory_size():
+    """Test if memory sizes accept unit suffixes."""
+    assert memory_size(1000) == 1000
+    assert memory_size("2K") == 2048
+    assert memory_size("1.5m") == 1536 * 1024
+    assert memory_size("1G") == 1024**3
+
+
+def test_invalid_isolate():
+    """Test if only process isolation is accepted."""
+    with pytest.raises(ValueError):
+        create_cli("conftest.sleeping_handler", isolate="thread")
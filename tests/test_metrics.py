@@ -0,0 +1,91 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test command execution metrics."""
+
+import json
+
+import pytest
+import yaml
+
+from clidesc import CLIDesc
+
+DESCRIPTION = """
+---
+program: test_metrics
+description: Test metrics.
+metrics:
+  file: {filename}
+  sample: {sample}
+exceptions:
+- class: ValueError
+  exit_code: 4
+sub_commands:
+  commands:
+  - name: ok
+    description: Succeed.
+    handler: conftest.simple_handler
+    output: yes
+  - name: fail
+    description: Fail.
+    handler: conftest.failing_handler
+"""
+
+
+def __metrics_cli(filename, sample=1.0):
+    description = DESCRIPTION.format(filename=filename, sample=sample)
+    return CLIDesc(yaml.safe_load(description))
+
+
+def test_jsonl_metrics(tmp_path):
+    """Test if each execution is appended to a JSONL file."""
+    filename = tmp_path / "metrics.jsonl"
+    cli = __metrics_cli(filename)
+    cli.run(["ok"])
+    with pytest.raises(SystemExit):
+        cli.run(["fail"])
+    records = [
+        json.loads(line) for line in filename.read_text().split("\n")[:-1]
+    ]
+    assert [r["command"] for r in records] == ["ok", "fail"]
+    assert [r["exit_code"] for r in records] == [0, 4]
+    assert records[1]["exception"] == "ValueError"
+    assert all(r["parse"] >= 0 and r["handler"] >= 0 for r in records)
+
+
+def test_openmetrics(tmp_path):
+    """Test if aggregated metrics are written in OpenMetrics format."""
+    filename = tmp_path / "metrics.prom"
+    cli = __metrics_cli(filename)
+    cli.run(["ok"])
+    cli.run(["ok"])
+    text = filename.read_text()
+    assert (
+        'clidesc_command_duration_seconds_count{command="ok",phase="parse"} 2'
+        in text
+    )
+    assert 'clidesc_command_exits_total{command="ok",exit_code="0"} 2' in text
+    assert text.endswith("# EOF\n")
+
+
+def test_sampling(tmp_path):
+    """Test if executions are not measured when not sampled."""
+    filename = tmp_path / "metrics.jsonl"
+    cli = __metrics_cli(filename, sample=0)
+    cli.run(["ok"])
+    assert not filename.exists()
+    assert not cli.metrics.durations
@@ -0,0 +1,71 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test writing the output to (compressed) files."""
+
+import io
+import bz2
+import gzip
+import lzma
+
+import pytest
+
+from clidesc import CLIDesc
+
+OPENERS = {
+    "out.txt": open,
+    "out.jsonl.gz": gzip.open,
+    "out.jsonl.bz2": bz2.open,
+    "out.jsonl.xz": lzma.open,
+}
+
+
+def create_cli():
+    """Create a CLI with an `output_file` option."""
+    return CLIDesc(
+        {
+            "program": "test_output_file",
+            "description": "Test output file.",
+            "output_file": True,
+            "handler": "conftest.simple_handler",
+            "output": {"no_key": True},
+            "arguments": [
+                {"name": "values", "description": "values", "nargs": "*"}
+            ],
+        }
+    )
+
+
+@pytest.mark.parametrize("filename", sorted(OPENERS))
+def test_output_file(tmp_path, filename):
+    """Test if the output is written, compressed, to the output file."""
+    cli = create_cli()
+    cli.output_stream = io.StringIO()
+    values = [f"value {index}" for index in range(10000)]
+    path = tmp_path / filename
+    cli.run(["--output-file", str(path), *values])
+    assert cli.output_stream.getvalue() == ""
+    with OPENERS[filename](path, "rt") as output:
+        assert output.read() == "".join(f"- {v}\n" for v in values)
+
+
+def test_output_without_output_file():
+    """Test if the output is written to the output stream by default."""
+    cli = create_cli()
+    cli.output_stream = io.StringIO()
+    cli.run(["a", "b"])
+    assert cli.output_stream.getvalue() == "- a\n- b\n"
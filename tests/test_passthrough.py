@@ -0,0 +1,112 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test writing binary results and files to the output."""
+
+import io
+import os
+import gzip
+from unittest.mock import patch
+
+import pytest
+
+from clidesc import CLIDesc
+
+
+def create_cli(handler, output):
+    """Create a CLI with a handler that receives a single argument."""
+    return CLIDesc(
+        {
+            "program": "test_passthrough",
+            "description": "Test passthrough.",
+            "handler": handler,
+            "output": output,
+            "arguments": [{"name": "value", "description": "value"}],
+        }
+    )
+
+
+def test_bytes_written_to_buffer():
+    """Test if a bytes result is written to the binary buffer."""
+    cli = create_cli("conftest.bytes_handler", "{value}")
+    cli.output_stream = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    cli.run(["some data"])
+    assert cli.output_stream.buffer.getvalue() == b"some data"
+
+
+def test_bytes_written_to_text_stream():
+    """Test if a bytes result is decoded for streams without buffer."""
+    cli = create_cli("conftest.bytes_handler", True)
+    cli.output_stream = io.StringIO()
+    cli.run(["ação"])
+    assert cli.output_stream.getvalue() == "ação"
+
+
+@pytest.mark.parametrize("handler", ["path_handler", "open_handler"])
+def test_file_copied_with_sendfile(tmp_path, handler):
+    """Test if a file result is copied to the output file."""
+    source = tmp_path / "source.bin"
+    source.write_bytes(bytes(range(256)) * 8192)
+    cli = create_cli(f"conftest.{handler}", {"passthrough": "file"})
+    with open(tmp_path / "output.bin", "w") as output, patch(
+        "os.sendfile", wraps=os.sendfile
+    ) as sendfile:
+        cli.output_stream = output
+        print("header", file=output)
+        cli.run([str(source)])
+    assert sendfile.called
+    expected = b"header\n" + source.read_bytes()
+    assert (tmp_path / "output.bin").read_bytes() == expected
+
+
+def test_file_copied_without_sendfile(tmp_path):
+    """Test if a file is copied when `os.sendfile` is not supported."""
+    source = tmp_path / "source.bin"
+    source.write_bytes(b"some data")
+    cli = create_cli("conftest.path_handler", {"passthrough": "file"})
+    cli.output_stream = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    with patch("os.sendfile", side_effect=OSError(22, "Invalid")):
+        cli.run([str(source)])
+    assert cli.output_stream.buffer.getvalue() == b"some data"
+
+
+def test_file_copied_to_text_stream(tmp_path):
+    """Test if a file is decoded for streams without buffer."""
+    source = tmp_path / "source.txt"
+    source.write_text("some text")
+    cli = create_cli("conftest.path_handler", {"passthrough": "file"})
+    cli.output_stream = io.StringIO()
+    cli.run([str(source)])
+    assert cli.output_stream.getvalue() == "some text"
+
+
+def test_file_copied_to_compressed_output_file(tmp_path):
+    """Test if a file is compressed when copied to a `.gz` output file."""
+    source = tmp_path / "source.bin"
+    source.write_bytes(bytes(range(256)) * 8192)
+    description = {
+        "program": "test_passthrough",
+        "description": "Test passthrough.",
+        "output_file": True,
+        "handler": "conftest.path_handler",
+        "output": {"passthrough": "file"},
+        "arguments": [{"name": "value", "description": "value"}],
+    }
+    path = tmp_path / "output.bin.gz"
+    CLIDesc(description).run(["--output-file", str(path), str(source)])
+    with gzip.open(path, "rb") as output:
+        assert output.read() == source.read_bytes()
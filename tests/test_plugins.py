@@ -0,0 +1,70 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test discovery of plugin commands through entry points."""
+
+import yaml
+
+from clidesc import CLIDesc
+from clidesc import plugins
+
+
+class FakeEntryPoint:  # pylint: disable=too-few-public-methods
+    """Entry point that counts how many times it was loaded."""
+
+    loaded = 0
+
+    def __init__(self, name, command):
+        """Initialize entry point with the command it provides."""
+        self.name = name
+        self.command = command
+
+    def load(self):
+        """Load the command description."""
+        FakeEntryPoint.loaded += 1
+        return self.command
+
+
+def test_plugin_commands_are_merged_and_cached(monkeypatch, tmp_path):
+    """Test if plugin commands are added and the index is cached."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    command = {
+        "name": "echo",
+        "description": "Plugin command.",
+        "handler": "conftest.simple_handler",
+        "arguments": [{"name": "text", "description": "Some text."}],
+    }
+    monkeypatch.setattr(
+        plugins, "_entry_points", lambda _: [FakeEntryPoint("echo", command)]
+    )
+    description = """
+---
+program: test_plugins
+description: Test plugin commands.
+plugins: test_plugins.commands
+sub_commands:
+  commands:
+  - name: core
+    description: Core command.
+    handler: conftest.simple_handler
+"""
+    FakeEntryPoint.loaded = 0
+    for _ in range(2):
+        cli = CLIDesc(yaml.safe_load(description))
+        assert cli.run(["echo", "hello"]) == {"text": "hello"}
+    assert FakeEntryPoint.loaded == 1
+    assert cli.run(["core"]) == {}
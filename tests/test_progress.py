@@ -0,0 +1,79 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test progress reporters injected in handlers."""
+
+import io
+import sys
+
+from clidesc import CLIDesc
+from clidesc.progress import NullProgress, Progress, create_progress
+
+
+class Terminal(io.StringIO):
+    """Text stream that behaves as a terminal."""
+
+    def isatty(self):
+        """Report the stream as a terminal."""
+        return True
+
+
+def create_cli(progress):
+    """Create a CLI with a handler that reports progress."""
+    return CLIDesc(
+        {
+            "program": "test_progress",
+            "description": "Test progress.",
+            "handler": "conftest.progress_handler",
+            "progress": progress,
+            "arguments": [{"name": "count", "description": "count"}],
+        }
+    )
+
+
+def test_progress_suppressed_without_terminal(monkeypatch):
+    """Test if progress is not drawn if stderr is not a terminal."""
+    monkeypatch.setattr(sys, "stderr", io.StringIO())
+    assert create_cli(True).run(["1000"]) == "NullProgress"
+    assert sys.stderr.getvalue() == ""
+
+
+def test_progress_drawn_on_terminal(monkeypatch):
+    """Test if progress is drawn to stderr when it is a terminal."""
+    monkeypatch.setattr(sys, "stderr", Terminal())
+    cli = create_cli({"interval": 0, "description": "Working"})
+    assert cli.run(["3"]) == "Progress"
+    lines = sys.stderr.getvalue().split("\r")
+    assert lines[1].startswith("Working: 1/3 (33%)")
+    assert lines[-1].startswith("Working: 3/3 (100%)")
+    assert sys.stderr.getvalue().endswith("\n")
+
+
+def test_progress_redraws_are_rate_limited():
+    """Test if progress is not redrawn before the interval passes."""
+    terminal = Terminal()
+    with Progress(terminal, interval=3600) as progress:
+        for _ in range(1000):
+            progress.update()
+    assert progress.count == 1000
+    assert terminal.getvalue() == ""
+
+
+def test_create_progress():
+    """Test if the reporter depends on the stream being a terminal."""
+    assert isinstance(create_progress({}, io.StringIO()), NullProgress)
+    assert isinstance(create_progress({}, Terminal()), Progress)
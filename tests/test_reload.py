@@ -0,0 +1,130 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test reloading CLI descriptions."""
+
+import copy
+import time
+
+import pytest
+import yaml
+
+from clidesc import CLIDesc
+
+# pylint: disable=protected-access
+
+DESCRIPTION = """
+---
+program: test_reload
+description: Test reloading descriptions.
+sub_commands:
+  commands:
+  - name: first
+    description: First command.
+    handler: conftest.simple_handler
+    arguments:
+    - name: value
+      description: some value.
+  - name: second
+    description: Second command.
+    handler: conftest.simple_handler
+    arguments:
+    - name: value
+      description: some value.
+"""
+
+
+def test_reload_rebuilds_only_changed_commands():
+    """Test if only the parsers of changed commands are rebuilt."""
+    description = yaml.safe_load(DESCRIPTION)
+    cli = CLIDesc(description)
+    assert cli.run(["second", "x"]) == {"value": "x"}
+    commands = cli._CLIDesc__commands
+    parsers = {
+        path: commands.find(path).parser
+        for path in [(), ("first",), ("second",)]
+    }
+
+    changed = copy.deepcopy(description)
+    changed["sub_commands"]["commands"][1]["arguments"][0]["type"] = "int"
+    cli.reload(changed)
+    assert commands.find(()).parser is parsers[()]
+    assert commands.find(("first",)).parser is parsers[("first",)]
+    assert commands.find(("second",)).parser is not parsers[("second",)]
+    assert cli.run(["second", "10"]) == {"value": 10}
+    assert cli.run(["first", "10"]) == {"value": "10"}
+
+
+def test_reload_with_new_command():
+    """Test if adding a command rebuilds the parent command."""
+    description = yaml.safe_load(DESCRIPTION)
+    cli = CLIDesc(description)
+    cli.run(["first", "x"])
+    changed = copy.deepcopy(description)
+    changed["sub_commands"]["commands"].append(
+        {
+            "name": "third",
+            "description": "Third command.",
+            "handler": "conftest.simple_handler",
+        }
+    )
+    cli.reload(changed)
+    assert cli.run(["third"]) == {}
+
+
+def test_watch_reloads_changed_file(tmp_path):
+    """Test if a watched description file is reloaded on change."""
+    filename = tmp_path / "cli.yml"
+    filename.write_text(DESCRIPTION)
+    cli = CLIDesc.from_file(str(filename))
+    watcher = cli.watch(interval=0.01)
+    try:
+        assert cli.run(["first", "1"]) == {"value": "1"}
+        filename.write_text(
+            DESCRIPTION.replace("some value.", "int.\n      type: int")
+        )
+        deadline = time.time() + 5
+        result = cli.run(["first", "1"])
+        while result != {"value": 1} and time.time() < deadline:
+            time.sleep(0.01)
+            result = cli.run(["first", "1"])
+        assert result == {"value": 1}
+    finally:
+        watcher.stop()
+
+
+def test_watch_keeps_description_on_errors(tmp_path, capsys):
+    """Test if an invalid description file is reported, and not used."""
+    filename = tmp_path / "cli.yml"
+    filename.write_text(DESCRIPTION)
+    cli = CLIDesc.from_file(str(filename))
+    watcher = cli.watch(interval=0.01)
+    try:
+        filename.write_text(DESCRIPTION + "  - name: [third\n")
+        deadline = time.time() + 5
+        while "cannot reload" not in capsys.readouterr().err:
+            assert time.time() < deadline
+            time.sleep(0.01)
+            assert cli.run(["first", "1"]) == {"value": "1"}
+    finally:
+        watcher.stop()
+
+
+def test_watch_requires_a_file():
+    """Test if descriptions not loaded from files cannot be watched."""
+    with pytest.raises(ValueError):
+        CLIDesc(yaml.safe_load(DESCRIPTION)).watch()
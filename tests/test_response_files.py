@@ -0,0 +1,97 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test reading argument values from response files and stdin."""
+
+import io
+import sys
+import types
+
+import pytest
+import yaml
+
+from clidesc import CLIDesc
+
+
+def __ids_cli(lazy=False):
+    description = f"""
+---
+program: test_response_files
+description: Test response files.
+handler: conftest.simple_handler
+arguments:
+- name: ids
+  description: list of ids.
+  type: int
+  nargs: '*'
+  response_files: yes
+  lazy: {'yes' if lazy else 'no'}
+"""
+    return CLIDesc(yaml.safe_load(description))
+
+
+@pytest.fixture(name="ids_file")
+def _ids_file(tmp_path):
+    path = tmp_path / "ids.txt"
+    path.write_text("10\n20\n\n30\n")
+    return str(path)
+
+
+def test_response_file_values(ids_file):
+    """Test if values are read from a response file."""
+    result = __ids_cli().run(["1", f"@{ids_file}", "2"])
+    assert result["ids"] == [1, 10, 20, 30, 2]
+
+
+def test_values_from_stdin(monkeypatch):
+    """Test if values are read from stdin."""
+    monkeypatch.setattr(sys, "stdin", io.StringIO("5\n6\n"))
+    assert __ids_cli().run(["-"])["ids"] == [5, 6]
+
+
+def test_lazy_values(ids_file):
+    """Test if lazy arguments are provided as an iterator."""
+    result = __ids_cli(lazy=True).run([f"@{ids_file}"])
+    assert isinstance(result["ids"], types.GeneratorType)
+    assert list(result["ids"]) == [10, 20, 30]
+
+
+def test_invalid_value_in_response_file(tmp_path):
+    """Test if invalid values in response files are usage errors."""
+    path = tmp_path / "ids.txt"
+    path.write_text("10\nabc\n")
+    with pytest.raises(SystemExit):
+        __ids_cli().run([f"@{path}"])
+
+
+def test_lazy_values_cannot_be_cached():
+    """Test if caching results of lazy arguments is rejected."""
+    description = yaml.safe_load("""
+---
+program: test_response_files
+description: Test response files.
+handler: conftest.simple_handler
+cache: yes
+arguments:
+- name: ids
+  description: list of ids.
+  nargs: '*'
+  response_files: yes
+  lazy: yes
+""")
+    with pytest.raises(ValueError):
+        CLIDesc(description)
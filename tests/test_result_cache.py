@@ -0,0 +1,102 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test caching of handler results."""
+
+import pytest
+import yaml
+
+import conftest
+from clidesc import CLIDesc
+from clidesc.cache import DiskCache, MemoryCache, ResultCache
+
+
+def __cached_cli(cache):
+    description = f"""
+---
+program: test_cache
+description: Test result caching.
+handler: conftest.counting_handler
+cache: {cache}
+arguments:
+- name: host
+  description: host to lookup.
+- name: verbose
+  description: verbose output.
+  type: bool
+  optional: yes
+"""
+    return CLIDesc(yaml.safe_load(description))
+
+
+def test_cached_result_skips_handler():
+    """Test if a cached result is returned without calling the handler."""
+    cli = __cached_cli("{key: [host]}")
+    conftest.CALLS.clear()
+    assert cli.run(["example.com"]) == {"host": "example.com", "verbose": False}
+    assert cli.run(["example.com", "--verbose"])["verbose"] is False
+    assert len(conftest.CALLS) == 1
+    cli.run(["example.org"])
+    assert len(conftest.CALLS) == 2
+
+
+def test_bypass_and_refresh_flags():
+    """Test the flags to bypass and refresh the cache."""
+    cli = __cached_cli("yes")
+    conftest.CALLS.clear()
+    cli.run(["example.com"])
+    cli.run(["example.com", "--no-cache"])
+    cli.run(["example.com", "--refresh-cache"])
+    cli.run(["example.com"])
+    assert len(conftest.CALLS) == 3
+
+
+def test_memory_cache_eviction_and_ttl():
+    """Test LRU eviction and expiration of memory cache entries."""
+    cache = MemoryCache(max_entries=2)
+    for key in "abc":
+        cache.set(key, key.upper())
+    assert len(cache) == 2
+    assert cache.get("a") == (False, None)
+    assert cache.get("c") == (True, "C")
+    cache = MemoryCache(ttl=-1)
+    cache.set("a", 1)
+    assert cache.get("a") == (False, None)
+
+
+def test_disk_cache_eviction(tmp_path):
+    """Test size based eviction of disk cache entries."""
+    cache = DiskCache(str(tmp_path), max_entries=2)
+    for key in "abc":
+        cache.set(key, key.upper())
+    assert cache.get("a") == (False, None)
+    assert DiskCache(str(tmp_path)).get("c") == (True, "C")
+
+
+def test_incomplete_cache_cannot_be_created():
+    """Test if caches must implement `get` and `set`."""
+
+    # pylint: disable=abstract-method, too-few-public-methods
+    class IncompleteCache(ResultCache):
+        """Cache that does not implement `set`."""
+
+        def get(self, _key):
+            """Return a cache miss."""
+            return False, None
+
+    with pytest.raises(TypeError):
+        IncompleteCache()  # pylint: disable=abstract-class-instantiated
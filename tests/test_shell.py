@@ -0,0 +1,90 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test the interactive shell."""
+
+import io
+
+import yaml
+
+from clidesc import CLIDesc
+from clidesc.shell import Shell
+
+DESCRIPTION = """
+---
+program: test_shell
+description: Test interactive shell.
+shell:
+  prompt: "> "
+exceptions:
+- class: ValueError
+  exit_code: 3
+  message: "Invalid value: {exception}"
+sub_commands:
+  commands:
+  - name: greet
+    aliases: [hello]
+    description: Greet someone.
+    handler: conftest.simple_handler
+    output: "Hello, {someone}!"
+    arguments:
+    - name: someone
+      description: someone to greet.
+    - name: shout
+      description: shout the greeting.
+      type: bool
+      optional: yes
+  - name: fail
+    description: Always fail.
+    handler: conftest.failing_handler
+"""
+
+
+def test_shell_executes_lines_and_survives_errors(capsys):
+    """Test if the shell executes commands and continues on errors."""
+    cli = CLIDesc(yaml.safe_load(DESCRIPTION))
+    lines = "greet World\nfail\nunknown\ngreet 'Big World'\n"
+    cli.shell(stdin=io.StringIO(lines))
+    output = capsys.readouterr()
+    assert "Hello, World!" in output.out
+    assert "Invalid value: always fails" in output.out
+    assert "invalid choice: 'unknown'" in output.err
+    assert "Hello, Big World!" in output.out
+    assert cli.exit_code == 0
+
+
+def test_shell_completion():
+    """Test if completion is driven by the CLI description."""
+    description = yaml.safe_load(DESCRIPTION)
+    shell = Shell(CLIDesc(description), description)
+    assert shell.completenames("gr") == ["greet"]
+    assert shell.completedefault("--s", "greet --s", 6, 9) == ["--shout"]
+    assert shell.completenames("he") == ["hello"]
+    assert shell.completedefault("--s", "hello --s", 6, 9) == ["--shout"]
+    assert shell.completedefault("", 'greet "abc ', 11, 11) == []
+
+
+def test_shell_reports_invalid_lines(capsys):
+    """Test if unbalanced quotes and --shell are reported per line."""
+    cli = CLIDesc(yaml.safe_load(DESCRIPTION))
+    lines = 'greet "World\n--shell\nhelp "greet\ngreet World\n'
+    cli.shell(stdin=io.StringIO(lines))
+    output = capsys.readouterr()
+    assert output.err.count("No closing quotation") == 2
+    assert "--shell cannot be used in the shell" in output.err
+    assert "Hello, World!" in output.out
+    assert cli.exit_code == 0
@@ -0,0 +1,185 @@
+# This file is part of clidesc
+#
+# Copyright (C) 2020 Rafael Guterres Jeffman
+#
+# f/π is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Foobar is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Foobar.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Test recording and replaying command execution traces."""
+
+import json
+import shutil
+
+import pytest
+import yaml
+
+from clidesc import CLIDesc
+from clidesc.trace import read_trace
+from clidesc.replay import compare, main, replay
+
+DESCRIPTION = """
+---
+program: test_trace
+description: Test traces.
+sub_commands:
+  commands:
+  - name: ok
+    description: Succeeding command.
+    handler: conftest.counting_handler
+    output: "{value}"
+    arguments:
+    - name: value
+      description: some value.
+  - name: fail
+    description: Failing command.
+    handler: conftest.failing_handler
+  - name: echo
+    description: Piped command.
+    handler: conftest.simple_handler
+    arguments:
+    - name: value
+      description: piped value.
+      pipe: yes
+"""
+
+
+def create_trace(tmp_path):
+    """Create a description file, and a trace of executions."""
+    description = tmp_path / "cli.yml"
+    trace = tmp_path / "trace.jsonl"
+    description.write_text(DESCRIPTION)
+    cli = CLIDesc(dict(yaml.safe_load(DESCRIPTION), trace=str(trace)))
+    cli.run(["ok", "1"])
+    try:
+        cli.run(["fail"])
+    except ValueError:
+        pass
+    return str(description), str(trace)
+
+
+def test_trace_records(tmp_path, capsys):
+    """Test if command executions are recorded in the trace file."""
+    _, trace = create_trace(tmp_path)
+    capsys.readouterr()
+    records = read_trace(trace)
+    assert [r["argv"] for r in records] == [["ok", "1"], ["fail"]]
+    assert [r["command"] for r in records] == ["ok", "fail"]
+    assert [r["exception"] for r in records] == [None, "ValueError"]
+    assert [r["exit_code"] for r in records] == [0, 1]
+    assert set(records[0]["phases"]) == {"parse", "handler", "render"}
+
+
+def test_replay_with_stubs(tmp_path, capsys):
+    """Test if stubbed replays do not call the handlers."""
+    from conftest import CALLS  # pylint: disable=import-outside-toplevel
+
+    description, trace = create_trace(tmp_path)
+    capsys.readouterr()
+    calls = len(CALLS)
+    records = read_trace(trace)
+    cli = CLIDesc.from_file(description)
+    durations = replay(cli, records, stub=True, repeat=3)
+    assert len(CALLS) == calls
+    assert len(durations[("ok", "parse")]) == 3
+    assert len(durations[("fail", "handler")]) == 3
+    rows = compare(records, durations)
+    assert [row[:2] for row in rows[:3]] == [
+        ("fail", "parse"),
+        ("fail", "handler"),
+        ("fail", "render"),
+    ]
+    assert capsys.readouterr().out == ""
+
+
+def test_replay_tool(tmp_path, capsys):
+    """Test if the replay tool reports latencies per command and phase."""
+    from conftest import CALLS  # pylint: disable=import-outside-toplevel
+
+    description, trace = create_trace(tmp_path)
+    capsys.readouterr()
+    calls = len(CALLS)
+    assert main([description, trace]) == 0
+    assert len(CALLS) == calls + 1
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split() == [
+        "command",
+        "phase",
+        "recorded",
+        "replayed",
+        "change",
+    ]
+    assert [line.split()[:2] for line in lines[1:]] == [
+        ["fail", "parse"],
+        ["fail", "handler"],
+        ["fail", "render"],
+        ["ok", "parse"],
+        ["ok", "handler"],
+        ["ok", "render"],
+    ]
+
+
+def test_piped_stages_are_not_replayed(tmp_path, capsys):
+    """Test if pipeline stages with piped input are flagged, and skipped."""
+    description, trace = create_trace(tmp_path)
+    cli = CLIDesc(dict(yaml.safe_load(DESCRIPTION), trace=trace))
+    cli.run(["ok", "1", ":::", "echo"])
+    capsys.readouterr()
+    records = read_trace(trace)
+    assert [r["piped"] for r in records] == [False, False, False, True]
+    durations = replay(CLIDesc.from_file(description), records)
+    assert ("echo", "parse") not in durations
+    assert len(durations[("ok", "parse")]) == 2
+    assert "echo" not in [row[0] for row in compare(records, durations)]
+
+
+def test_unexpected_replay_errors(tmp_path, capsys):
+    """Test if commands failing only when replayed are reported."""
+    description, trace = create_trace(tmp_path)
+    records = read_trace(trace)
+    records[0]["argv"] = ["fail"]
+    with pytest.raises(RuntimeError):
+        replay(CLIDesc.from_file(description), records)
+    with open(trace, "w") as trace_file:
+        trace_file.write(json.dumps(records[0]) + "\n")
+    capsys.readouterr()
+    assert main([description, trace]) == 1
+    assert "failed, but not when traced" in capsys.readouterr().err
+
+
+def test_replay_without_side_effects(tmp_path, capsys):
+    """Test if replays do not write output files, nor cache stub results."""
+    trace = str(tmp_path / "trace.jsonl")
+    output = tmp_path / "output.txt"
+    description = yaml.safe_load(f"""
+---
+program: test_trace
+description: Test traces.
+output_file: yes
+handler: conftest.counting_handler
+output: "{{value}}"
+cache:
+  store: disk
+  path: {tmp_path / "cache"}
+arguments:
+- name: value
+  description: some value.
+""")
+    cli = CLIDesc(dict(description, trace=trace))
+    cli.run(["--output-file", str(output), "1"])
+    records = read_trace(trace)
+    capsys.readouterr()
+    shutil.rmtree(tmp_path / "cache")
+    replay(CLIDesc(description), records, stub=True)
+    assert output.read_text() == "1\n"
+    assert CLIDesc(description).run(["1"]) == {"value": "1"}
+    assert capsys.readouterr().out == "1\n"